@@ -0,0 +1,105 @@
+import hashlib
+import os
+import re
+import shutil
+
+from writer import remove_output, temp_path_for
+
+FINGERPRINT_LENGTH = 8
+
+_URL_ATTRIBUTE_PATTERN = re.compile(r'\b(href|src)="([^"]*)"')
+
+class AssetReport:
+    def __init__(self):
+        self.copied : list[str] = []
+        self.unchanged = 0
+        self.removed : list[str] = []
+        self.bytes_copied = 0
+
+    def __repr__(self):
+        return f"AssetReport({len(self.copied)} copied, {self.unchanged} unchanged, {len(self.removed)} removed)"
+
+def find_assets(static_dir : str) -> list[str]:
+    assets = []
+    for dir_path, dir_names, file_names in os.walk(static_dir):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            source = os.path.relpath(os.path.join(dir_path, file_name), static_dir)
+            assets.append(source.replace(os.sep, "/"))
+    return assets
+
+def hash_file(path : str) -> str:
+    with open(path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+def fingerprint_name(source : str, digest : str) -> str:
+    directory, _, file_name = source.rpartition("/")
+    stem, dot, extension = file_name.rpartition(".")
+    if not stem:
+        stem, dot, extension = file_name, "", ""
+    fingerprinted = f"{stem}.{digest[:FINGERPRINT_LENGTH]}{dot}{extension}"
+    return f"{directory}/{fingerprinted}" if directory else fingerprinted
+
+def copy_file_atomic(source_path : str, path : str, hard_link : bool = False) -> None:
+    temp_path = temp_path_for(path)
+    try:
+        if hard_link:
+            try:
+                os.link(source_path, temp_path)
+            except OSError:
+                shutil.copy2(source_path, temp_path)
+        else:
+            shutil.copy2(source_path, temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def _is_current(stat : os.stat_result, path : str) -> bool:
+    try:
+        output_stat = os.stat(path)
+    except FileNotFoundError:
+        return False
+    if (output_stat.st_dev, output_stat.st_ino) == (stat.st_dev, stat.st_ino):
+        return True
+    return output_stat.st_size == stat.st_size and output_stat.st_mtime_ns == stat.st_mtime_ns
+
+def sync_assets(static_dir : str, public_dir : str, old_assets : dict, fingerprint : bool = False, hard_link : bool = False, copy_files : bool = True) -> tuple[dict, AssetReport]:
+    report = AssetReport()
+    new_assets = {}
+    for source in find_assets(static_dir):
+        source_path = os.path.join(static_dir, source)
+        stat = os.stat(source_path)
+        old = old_assets.get(source)
+        if old is not None and old.get("size") == stat.st_size and old.get("mtime") == stat.st_mtime_ns:
+            digest = old["hash"]
+        else:
+            digest = hash_file(source_path)
+        output = fingerprint_name(source, digest) if fingerprint else source
+        entry = {"hash": digest, "size": stat.st_size, "mtime": stat.st_mtime_ns, "output": output}
+        new_assets[source] = entry
+        if not copy_files:
+            continue
+        output_path = os.path.join(public_dir, output)
+        if os.path.exists(output_path) and (fingerprint or old == entry or _is_current(stat, output_path)):
+            report.unchanged += 1
+            continue
+        copy_file_atomic(source_path, output_path, hard_link)
+        report.copied.append(source)
+        report.bytes_copied += stat.st_size
+
+    outputs = {entry["output"] for entry in new_assets.values()}
+    for entry in old_assets.values():
+        if copy_files and entry.get("output") not in outputs:
+            remove_output(public_dir, entry["output"])
+            report.removed.append(entry["output"])
+    return new_assets, report
+
+def asset_urls(assets : dict) -> dict[str, str]:
+    return {f"/{source}": f"/{entry['output']}" for source, entry in assets.items() if entry["output"] != source}
+
+def rewrite_asset_urls(html : str, urls : dict[str, str]) -> str:
+    if not urls:
+        return html
+    return _URL_ATTRIBUTE_PATTERN.sub(lambda match: f'{match.group(1)}="{urls.get(match.group(2), match.group(2))}"', html)
@@ -0,0 +1,581 @@
+import argparse
+import hashlib
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+from block import BlockType, block_to_block_type, iter_blocks, markdown_to_blocks
+from build import RenderOptions, build_site
+from htmlnode import FrozenNode, HTMLNode, LeafNode, ParentNode, count_nodes, escape_text, freeze, get_fragment_cache, render_props, text_node_to_html_node, write_tokens_html
+from page import block_inline_texts, block_to_html_node, markdown_to_html_node, text_to_children, write_markdown_html
+from parser import split_nodes_delimiter, split_nodes_image, split_nodes_link, text_to_textnodes, text_to_tokens
+from textnode import TextNode, TextType
+
+def chained_text_to_textnodes(text : str) -> list[TextNode]:
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    nodes = split_nodes_image(nodes)
+    nodes = split_nodes_link(nodes)
+    return nodes
+
+def sliced_split_nodes_link(old_nodes : list[TextNode]) -> list[TextNode]:
+    result_node_list = []
+    for old_node in old_nodes:
+        if old_node.text_type != TextType.TEXT:
+            result_node_list.append(old_node)
+            continue
+        text = old_node.text
+        while len(text) > 0:
+            match_text = re.search(r"(?<!\!)\[([^\]]+)\]\(([^\)]+)\)", text)
+            if match_text is not None:
+                result_node_list.append(TextNode(text[:match_text.start()], old_node.text_type))
+                result_node_list.append(TextNode(match_text.group(1), TextType.LINK, match_text.group(2)))
+                text = text[match_text.end():]
+            else:
+                result_node_list.append(TextNode(text, old_node.text_type))
+                text = ""
+    return result_node_list
+
+def concat_to_html(node : HTMLNode) -> str:
+    props_html = ""
+    if node.props is not None:
+        for key, value in node.props.items():
+            props_html += f" {key}=\"{value}\""
+    if node.children is None:
+        if node.tag is None:
+            return node.value
+        return f"<{node.tag}{props_html}>{node.value}</{node.tag}>"
+    children_html = ""
+    for child in node.children:
+        children_html += concat_to_html(child)
+    return f"<{node.tag}{props_html}>{children_html}</{node.tag}>"
+
+def make_listing_page(items : int) -> ParentNode:
+    entries = [
+        ParentNode("li", [
+            LeafNode("a", f"Post number {index}", {"href": f"/posts/{index}.html"}),
+            LeafNode(None, " - "),
+            LeafNode("i", "a short summary of the post"),
+        ])
+        for index in range(items)
+    ]
+    return ParentNode("html", [ParentNode("body", [ParentNode("ul", entries)])])
+
+def peak_memory(func) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+class DictTextNode:
+    def __init__(self, text : str, text_type : TextType, url : str = None):
+        self.text = text
+        self.text_type = text_type
+        self.url = url
+
+class DictHTMLNode:
+    def __init__(self, tag = None, value = None, children = None, props = None):
+        self.tag = tag
+        self.value = value
+        self.children = children
+        self.props = props
+
+class DictLeafNode(DictHTMLNode):
+    def __init__(self, tag : str, value : str, props : dict = None):
+        super().__init__()
+        self.tag = tag
+        self.value = value
+        self.props = props
+
+def make_markdown_page(index : int, paragraphs : int = 40) -> str:
+    blocks = [f"# Page {index}"]
+    for paragraph in range(paragraphs):
+        blocks.append(make_span_text(20 + paragraph % 7))
+        if paragraph % 5 == 0:
+            blocks.append("\n".join(f"- item **{item}** of [list](/list/{item})" for item in range(8)))
+        if paragraph % 9 == 0:
+            blocks.append("> quoted _text_ from\n> another page")
+    return "\n\n".join(blocks)
+
+def write_site(root : str, pages : int) -> tuple[str, str]:
+    content_dir = os.path.join(root, "content")
+    for index in range(pages):
+        page_dir = os.path.join(content_dir, f"section{index % 10}")
+        os.makedirs(page_dir, exist_ok=True)
+        with open(os.path.join(page_dir, f"page{index}.md"), "w", encoding="utf-8") as file:
+            file.write(make_markdown_page(index))
+    template_path = os.path.join(root, "template.html")
+    with open(template_path, "w", encoding="utf-8") as file:
+        file.write("<html><head><title>{{ Title }}</title></head><body>{{ Content }}</body></html>")
+    return content_dir, template_path
+
+def hash_tree(root : str) -> str:
+    digest = hashlib.sha256()
+    for dir_path, dir_names, file_names in os.walk(root):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            path = os.path.join(dir_path, file_name)
+            digest.update(os.path.relpath(path, root).encode("utf-8"))
+            with open(path, "rb") as file:
+                digest.update(file.read())
+    return digest.hexdigest()
+
+def regex_block_to_block_type(block : str) -> BlockType:
+    if re.fullmatch("#{1:6} .+", block):
+        return BlockType.HEADING
+    elif re.fullmatch("`{3}\n.+`{3}", block):
+        return BlockType.CODE
+    elif re.fullmatch("> [^\n]+(?:\n> [^\n]+)*", block):
+        return BlockType.QUOTE
+    elif re.fullmatch("- [^\n]+(?:\n- [^\n]+)*", block):
+        return BlockType.UNORDERED_LIST
+    elif re.fullmatch("(\\d+)\\. [^\n]+(?:\n(\\d+)\\. [^\n]+)*", block):
+        match_order_list = re.findall("^(\\d+)\\. [^\n]+", block, flags=re.MULTILINE)
+        for index in range(1, len(match_order_list) + 1):
+            if index != match_order_list[index - 1]:
+                return BlockType.PARAGRAPH
+        return BlockType.ORDERED_LIST
+    else:
+        return BlockType.PARAGRAPH
+
+def make_block_corpus(blocks : int) -> list[str]:
+    samples = [
+        "## A section heading",
+        "A plain paragraph of text\nthat spans two lines.",
+        "```\nprint('hello')\nprint('world')\n```",
+        "> a quoted line\n> and another",
+        "- first item\n- second item\n- third item",
+        "\n".join(f"{index}. numbered item" for index in range(1, 9)),
+        "Another paragraph with **bold** text.",
+    ]
+    return [samples[index % len(samples)] for index in range(blocks)]
+
+def make_span_text(spans : int) -> str:
+    pieces = [
+        "plain words **bold words** more text ",
+        "an _italic phrase_ here ",
+        "with `inline code` inside ",
+        "an ![image alt](https://example.com/img.png) image ",
+        "and a [link label](https://example.com/page) link ",
+    ]
+    return "".join(pieces[index % len(pieces)] for index in range(spans))
+
+def best_of(func, repeat : int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+def bench_inline(repeat : int = 5):
+    for spans in (100, 1000, 5000):
+        text = make_span_text(spans)
+        chained = best_of(lambda: chained_text_to_textnodes(text), repeat)
+        single = best_of(lambda: text_to_textnodes(text), repeat)
+        print(f"inline {spans:>5} spans: chained {chained * 1000:8.2f} ms  single pass {single * 1000:8.2f} ms  x{chained / single:.1f}")
+
+def bench_links(repeat : int = 3):
+    for links in (1000, 10000, 50000):
+        nodes = [TextNode("see [label](https://example.com/page) " * links, TextType.TEXT)]
+        sliced = best_of(lambda: sliced_split_nodes_link(nodes), repeat)
+        linear = best_of(lambda: split_nodes_link(nodes), repeat)
+        print(f"links {links:>6}: sliced {sliced * 1000:9.2f} ms  finditer {linear * 1000:9.2f} ms  x{sliced / linear:.1f}")
+
+def bench_html(repeat : int = 3):
+    def write_file():
+        with tempfile.TemporaryFile("w", encoding="utf-8") as sink:
+            page.write_html(sink)
+
+    for items in (1000, 10000, 100000):
+        page = make_listing_page(items)
+        timings = [
+            ("concat", lambda: concat_to_html(page)),
+            ("to_html", page.to_html),
+            ("write_html", write_file),
+        ]
+        for name, func in timings:
+            elapsed = best_of(func, repeat)
+            peak = peak_memory(func)
+            print(f"html {items:>6} items {name:<10}: {elapsed * 1000:9.2f} ms  peak {peak / 1024:10.1f} KiB")
+
+def make_nested_page(depth : int) -> ParentNode:
+    node = LeafNode("p", "deepest paragraph")
+    for level in range(depth):
+        node = ParentNode("blockquote" if level % 2 else "ul", [LeafNode(None, "text"), node])
+    return node
+
+def bench_depth(repeat : int = 3):
+    for depth in (100, 500, 100000):
+        page = make_nested_page(depth)
+        stack = best_of(page.to_html, repeat)
+        try:
+            recursive = f"{best_of(lambda: concat_to_html(page), repeat) * 1000:9.2f} ms"
+        except RecursionError:
+            recursive = "RecursionError"
+        print(f"depth {depth:>6}: recursive {recursive:>14}  explicit stack {stack * 1000:9.2f} ms")
+
+def bench_nodes(count : int = 200000, repeat : int = 3):
+    cases = [
+        ("TextNode", lambda: [DictTextNode("word", TextType.TEXT) for _ in range(count)],
+            lambda: [TextNode("word", TextType.TEXT) for _ in range(count)]),
+        ("LeafNode", lambda: [DictLeafNode("b", "word") for _ in range(count)],
+            lambda: [LeafNode("b", "word") for _ in range(count)]),
+    ]
+    for name, build_dict, build_slots in cases:
+        for label, build in (("dict", build_dict), ("slots", build_slots)):
+            elapsed = best_of(build, repeat)
+            peak = peak_memory(build)
+            print(f"nodes {name:<8} {label:<5}: {count / elapsed / 1e6:6.2f} M nodes/s  {peak / count:6.1f} bytes/node")
+
+def bench_build(pages : int = 400):
+    with tempfile.TemporaryDirectory() as root:
+        content_dir, template_path = write_site(root, pages)
+        baseline = None
+        for workers in (1, 2, 4, 8):
+            public_dir = os.path.join(root, f"public{workers}")
+            start = time.perf_counter()
+            build_site(content_dir, template_path, public_dir, workers=workers)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            identical = "identical" if hash_tree(public_dir) == hash_tree(os.path.join(root, "public1")) else "DIFFERENT"
+            print(f"build {pages} pages, {workers} workers: {elapsed * 1000:9.2f} ms  x{baseline / elapsed:.2f}  output {identical}")
+    print(f"({os.cpu_count()} CPUs available)")
+
+def bench_blocks(blocks : int = 70000, repeat : int = 5):
+    corpus = make_block_corpus(blocks)
+    for name, classify in (("regex chain", regex_block_to_block_type), ("dispatch", block_to_block_type)):
+        elapsed = best_of(lambda: [classify(block) for block in corpus], repeat)
+        print(f"blocks {blocks} {name:<11}: {elapsed * 1000:8.2f} ms  {blocks / elapsed / 1e6:5.2f} M blocks/s")
+
+def write_changelog(path : str, entries : int) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        for index in range(entries):
+            file.write(f"## Release {index}\n\n")
+            file.write(f"Fixed **issue {index}** reported in [the tracker](https://example.com/{index}).\n\n")
+            file.write("- first change\n- second change\n\n")
+            file.write("```\nexample()\n\nmore()\n```\n\n")
+
+def bench_stream(entries : int = 100000):
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "changelog.md")
+        write_changelog(path, entries)
+        size = os.path.getsize(path)
+
+        def split_whole():
+            with open(path, encoding="utf-8") as file:
+                return len([block.strip() for block in file.read().split("\n\n") if block])
+
+        def stream_blocks():
+            with open(path, encoding="utf-8") as file:
+                return sum(1 for _ in iter_blocks(file))
+
+        def stream_html():
+            with open(path, encoding="utf-8") as source, open(os.devnull, "w", encoding="utf-8") as sink:
+                write_markdown_html(source, sink)
+
+        for name, func in (("split whole", split_whole), ("iter_blocks", stream_blocks), ("stream html", stream_html)):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            peak = peak_memory(func)
+            print(f"stream {size / 1e6:.1f} MB {name:<11}: {elapsed * 1000:9.2f} ms  peak {peak / 1e6:8.2f} MB")
+
+CORPORA = {
+    "prose": lambda index: make_span_text(30 + index % 10),
+    "links": lambda index: " and ".join(f"[link {item}](https://example.com/{index}/{item})" for item in range(40)),
+    "lists": lambda index: "\n".join(f"- item **{item}** with a [link](/items/{item})" for item in range(200)),
+    "code": lambda index: "```\n" + "\n".join(f"value_{line} = compute({line}, <{index}>)" for line in range(2000)) + "\n```",
+}
+
+def make_corpus(kind : str, size : int) -> str:
+    blocks = []
+    total = 0
+    while total < size:
+        block = CORPORA[kind](len(blocks))
+        blocks.append(block)
+        total += len(block) + 2
+    return "\n\n".join(blocks)
+
+def time_stages(markdown : str, repeat : int) -> dict[str, dict]:
+    size_mb = len(markdown.encode("utf-8")) / 1e6
+    blocks = markdown_to_blocks(markdown)
+    block_types = [block_to_block_type(block) for block in blocks]
+    texts = [text for block, block_type in zip(blocks, block_types) for text in block_inline_texts(block, block_type)]
+    text_nodes = [text_node for text in texts for text_node in text_to_textnodes(text)]
+    tree = markdown_to_html_node(markdown)
+    stages = [
+        ("markdown_to_blocks", lambda: markdown_to_blocks(markdown), len(blocks)),
+        ("block_to_block_type", lambda: [block_to_block_type(block) for block in blocks], len(blocks)),
+        ("text_to_textnodes", lambda: [text_to_textnodes(text) for text in texts], len(text_nodes)),
+        ("text_node_to_html_node", lambda: [text_node_to_html_node(text_node) for text_node in text_nodes], len(text_nodes)),
+        ("text_to_tokens", lambda: [text_to_tokens(text) for text in texts], len(text_nodes)),
+        ("to_html", tree.to_html, count_nodes(tree)),
+    ]
+    results = {}
+    for name, func, nodes in stages:
+        seconds = best_of(func, repeat)
+        results[name] = {"seconds": seconds, "mb_per_s": size_mb / seconds, "nodes": nodes, "nodes_per_s": nodes / seconds}
+    return results
+
+def bench_pipeline(size : int = 1000000, repeat : int = 3) -> dict:
+    results = {"python": platform.python_version(), "corpus_bytes": size, "corpora": {}}
+    for kind in CORPORA:
+        stages = time_stages(make_corpus(kind, size), repeat)
+        results["corpora"][kind] = stages
+        for stage, result in stages.items():
+            print(f"pipeline {kind:<6} {stage:<23}: {result['seconds'] * 1000:9.2f} ms  {result['mb_per_s']:8.2f} MB/s  {result['nodes_per_s'] / 1e6:6.2f} M nodes/s")
+    return results
+
+def find_regressions(baseline : dict, current : dict, threshold : float, min_seconds : float = 0.001) -> list[str]:
+    regressions = []
+    for kind, stages in current.get("corpora", {}).items():
+        for stage, result in stages.items():
+            previous = baseline.get("corpora", {}).get(kind, {}).get(stage)
+            if previous is None or previous["seconds"] < min_seconds:
+                continue
+            slowdown = result["seconds"] / previous["seconds"] - 1
+            if slowdown > threshold:
+                regressions.append(f"{kind}/{stage}: {slowdown * 100:.0f}% slower ({previous['seconds'] * 1000:.2f} ms -> {result['seconds'] * 1000:.2f} ms)")
+    return regressions
+
+def allocations(func) -> tuple[int, int]:
+    tracemalloc.start()
+    try:
+        result = func()
+        snapshot = tracemalloc.take_snapshot()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return sum(stat.count for stat in snapshot.statistics("filename")), size
+
+def bench_tokens(size : int = 1000000, repeat : int = 3):
+    for kind in ("prose", "links", "lists"):
+        texts = make_corpus(kind, size).split("\n\n")
+
+        def textnodes():
+            return [[text_node_to_html_node(text_node) for text_node in text_to_textnodes(text)] for text in texts]
+
+        def tokens():
+            return [text_to_tokens(text) for text in texts]
+
+        def render_textnodes():
+            return "".join(text_node_to_html_node(text_node).to_html() for text in texts for text_node in text_to_textnodes(text))
+
+        def render_tokens():
+            chunks = []
+            for text in texts:
+                write_tokens_html(text_to_tokens(text), chunks.append)
+            return "".join(chunks)
+
+        for name, build, render in (("TextNode", textnodes, render_textnodes), ("tokens", tokens, render_tokens)):
+            objects, retained = allocations(build)
+            elapsed = best_of(render, repeat)
+            print(f"tokens {kind:<5} {name:<8}: {objects:>8} live objects  {retained / 1e6:7.2f} MB  render {elapsed * 1000:8.2f} ms")
+
+def concat_props(props : dict) -> str:
+    html_value = ""
+    if props is not None:
+        for key, value in props.items():
+            html_value += f" {key}=\"{value}\""
+    return html_value
+
+def bench_props(links : int = 100000, repeat : int = 9):
+    nav = [{"href": f"/section{index % 12}/index.html", "class": "nav-link"} for index in range(links)]
+    unique = [{"href": f"https://example.com/page/{index}?ref=a&b", "title": f"Page {index}"} for index in range(links)]
+    for name, props_list in (("repeated", nav), ("unique", unique)):
+        concat = best_of(lambda: [concat_props(props) for props in props_list], repeat)
+        escaped = best_of(lambda: [render_props(props) for props in props_list], repeat)
+        print(f"props {links} {name:<8}: concat (no escaping) {concat * 1000:8.2f} ms  memoized join {escaped * 1000:8.2f} ms  x{concat / escaped:.2f}")
+
+def bench_blockcache(pages : int = 400):
+    with tempfile.TemporaryDirectory() as root:
+        content_dir, template_path = write_site(root, pages)
+        for name, options in (("no block cache", None), ("block cache", RenderOptions(block_cache_dir=os.path.join(root, "blocks"), block_cache_size=1 << 30))):
+            public_dir = os.path.join(root, "public")
+            manifest_path = os.path.join(root, "manifest.json")
+            build_site(content_dir, template_path, public_dir, manifest_path, options=options)
+            for dir_path, _, file_names in os.walk(content_dir):
+                for file_name in file_names:
+                    with open(os.path.join(dir_path, file_name), "a", encoding="utf-8") as file:
+                        file.write(f"\n\nEdited for {name}.")
+            start = time.perf_counter()
+            report = build_site(content_dir, template_path, public_dir, manifest_path, options=options)
+            elapsed = time.perf_counter() - start
+            print(f"blockcache {pages} edited pages, {name:<14}: {elapsed * 1000:9.2f} ms  {report.block_cache_hits} hits  {report.block_cache_misses} misses")
+
+def write_code_site(root : str, pages : int) -> tuple[str, str]:
+    content_dir = os.path.join(root, "content")
+    os.makedirs(content_dir)
+    for index in range(pages):
+        snippets = [f"```python\ndef handler_{index}_{item}(request):\n    return render(request, \"page_{item}.html\", {{\"id\": {item}}})\n```" for item in range(10)]
+        with open(os.path.join(content_dir, f"page{index}.md"), "w", encoding="utf-8") as file:
+            file.write(f"# Page {index}\n\nCall `handler_{index}()` to render it.\n\n" + "\n\n".join(snippets))
+    template_path = os.path.join(root, "template.html")
+    with open(template_path, "w", encoding="utf-8") as file:
+        file.write("<title>{{ Title }}</title>{{ Content }}")
+    return content_dir, template_path
+
+def bench_highlight(pages : int = 200):
+    try:
+        import pygments
+        highlighter = "pygments"
+    except ImportError:
+        highlighter = "plain"
+    with tempfile.TemporaryDirectory() as root:
+        content_dir, template_path = write_code_site(root, pages)
+        cache_dir = os.path.join(root, "highlight")
+        runs = (
+            ("no highlighting", 1, RenderOptions()),
+            ("no cache", 1, RenderOptions(highlighter=highlighter)),
+            ("cold cache", 1, RenderOptions(highlighter=highlighter, highlight_cache_dir=cache_dir, highlight_cache_size=1 << 30)),
+            ("warm cache", 1, RenderOptions(highlighter=highlighter, highlight_cache_dir=cache_dir, highlight_cache_size=1 << 30)),
+            ("no cache, 4 workers", 4, RenderOptions(highlighter=highlighter)),
+        )
+        for name, workers, options in runs:
+            start = time.perf_counter()
+            report = build_site(content_dir, template_path, os.path.join(root, "public"), workers=workers, options=options)
+            elapsed = time.perf_counter() - start
+            print(f"highlight {pages} pages with {highlighter}, {name:<19}: {elapsed * 1000:9.2f} ms  {report.highlight_hits} hits  "
+                  f"{report.highlight_misses} misses  {report.highlight_seconds * 1000:9.2f} ms highlighting")
+
+def import_times(command : list[str], stdin : bytes) -> dict[str, int]:
+    result = subprocess.run([sys.executable, "-X", "importtime", *command], input=stdin, capture_output=True, check=True)
+    times = {}
+    for line in result.stderr.decode("utf-8").splitlines():
+        if line.startswith("import time:") and "|" in line and "cumulative" not in line:
+            _, cumulative, name = line.split("|")
+            if not name.startswith("  "):
+                times[name.strip()] = int(cumulative)
+    return times
+
+def bench_startup(runs : int = 20):
+    source_dir = os.path.dirname(os.path.abspath(__file__))
+    markdown = make_markdown_page(0, 4).encode("utf-8")
+    commands = {
+        "python -c pass": ["-c", "pass"],
+        "import build": ["-c", "import build"],
+        "convert.py": [os.path.join(source_dir, "convert.py")],
+    }
+    environment = dict(os.environ, PYTHONPATH=source_dir)
+    for name, command in commands.items():
+        elapsed = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, *command], input=markdown, stdout=subprocess.DEVNULL, check=True, env=environment)
+            elapsed.append(time.perf_counter() - start)
+        elapsed.sort()
+        print(f"startup {name:<15}: best {elapsed[0] * 1000:7.2f} ms  median {elapsed[len(elapsed) // 2] * 1000:7.2f} ms")
+    times = import_times([os.path.join(source_dir, "convert.py")], markdown)
+    slowest = sorted(times.items(), key=lambda item: -item[1])[:8]
+    print("convert.py top-level imports: " + ", ".join(f"{name} {microseconds / 1000:.1f} ms" for name, microseconds in slowest))
+
+def make_nav(sections : int) -> ParentNode:
+    return ParentNode("nav", [ParentNode("ul", [
+        ParentNode("li", [LeafNode("a", f"Section {index}", {"href": f"/section{index}/", "class": "nav-link"})]) for index in range(sections)
+    ])])
+
+def make_footer(year : int) -> ParentNode:
+    return ParentNode("footer", [ParentNode("p", [LeafNode(None, f"(c) {year}, built with "), LeafNode("a", "the generator", {"href": "/about/"})])] * 10)
+
+def bench_fragments(pages : int = 2000, repeat : int = 3):
+    shared = [freeze(make_nav(40), ("nav", 40)), freeze(make_footer(2024), ("footer", 2024))]
+    strategies = {
+        "rebuilt": lambda: (make_nav(40), make_footer(2024)),
+        "frozen per page": lambda: (FrozenNode(("nav", 40), lambda: make_nav(40)), FrozenNode(("footer", 2024), lambda: make_footer(2024))),
+        "frozen shared": lambda: shared,
+    }
+    baseline = None
+    for name, partials in strategies.items():
+        def render():
+            for index in range(pages):
+                nav, footer = partials()
+                ParentNode("body", [nav, LeafNode("main", f"page {index}"), footer]).to_html()
+        get_fragment_cache().clear()
+        elapsed = best_of(render, repeat)
+        baseline = baseline or elapsed
+        peak = peak_memory(render)
+        print(f"fragments {pages} pages, {name:<15}: {elapsed * 1000:9.2f} ms  x{baseline / elapsed:.2f}  peak {peak / 1024:8.1f} KiB")
+
+def per_line_nodes(block : str) -> HTMLNode:
+    block_type = block_to_block_type(block)
+    if block_type == BlockType.CODE:
+        lines = block[block.index("\n") + 1:-3].split("\n")
+        return ParentNode("pre", [ParentNode("code", [LeafNode(None, escape_text(line) + "\n") for line in lines])])
+    tag = "ul" if block_type == BlockType.UNORDERED_LIST else "ol"
+    return ParentNode(tag, [ParentNode("li", text_to_children(text)) for text in block_inline_texts(block, block_type)])
+
+def bench_huge(sizes : tuple[int, ...] = (10000, 100000, 1000000)):
+    for lines in sizes:
+        blocks = {
+            "code": "```\n" + "".join(f"if value_{line} < limit: total += {line} & mask\n" for line in range(lines)) + "```",
+            "list": "\n".join(f"- entry **{line}** returns a [value](/api/{line}.html)" for line in range(lines)),
+        }
+        for kind, block in blocks.items():
+            for name, build in (("per-line nodes", per_line_nodes), ("streamed", block_to_html_node)):
+                def render():
+                    with open(os.devnull, "w", encoding="utf-8") as sink:
+                        build(block).write_html(sink)
+                start = time.perf_counter()
+                render()
+                elapsed = time.perf_counter() - start
+                peak = peak_memory(render)
+                print(f"huge {kind} {lines:>8} lines, {name:<14}: {elapsed * 1000:9.2f} ms  peak {peak / 1e6:8.2f} MB")
+
+BENCHMARKS = {
+    "inline": bench_inline,
+    "links": bench_links,
+    "html": bench_html,
+    "depth": bench_depth,
+    "nodes": bench_nodes,
+    "blocks": bench_blocks,
+    "build": bench_build,
+    "stream": bench_stream,
+    "pipeline": bench_pipeline,
+    "tokens": bench_tokens,
+    "props": bench_props,
+    "blockcache": bench_blockcache,
+    "startup": bench_startup,
+    "fragments": bench_fragments,
+    "huge": bench_huge,
+    "highlight": bench_highlight,
+}
+
+def main(argv : list[str]) -> int:
+    arg_parser = argparse.ArgumentParser(description="Run the benchmarks.")
+    arg_parser.add_argument("names", nargs="*", help=f"benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    arg_parser.add_argument("--json", metavar="PATH", help="save the results of the pipeline benchmark as JSON")
+    arg_parser.add_argument("--compare", metavar="PATH", help="compare the pipeline benchmark against a saved JSON run")
+    arg_parser.add_argument("--threshold", type=float, default=0.2, help="slowdown ratio reported as a regression (default 0.2)")
+    args = arg_parser.parse_args(argv)
+
+    names = args.names or list(BENCHMARKS)
+    if args.json or args.compare:
+        names = names if "pipeline" in names else names + ["pipeline"]
+    results = {}
+    for name in names:
+        if name not in BENCHMARKS:
+            arg_parser.error(f"unknown benchmark: {name}")
+        results[name] = BENCHMARKS[name]()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results["pipeline"], file, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = find_regressions(baseline, results["pipeline"], args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
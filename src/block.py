@@ -1,5 +1,8 @@
 from enum import Enum
+import io
+import mmap
 import re
+from collections.abc import Iterable, Iterator
 
 class BlockType(Enum):
     PARAGRAPH = "paragraph"
@@ -10,22 +13,84 @@ class BlockType(Enum):
     ORDERED_LIST = "ordered_list"
 
 def markdown_to_blocks(markdown : str) -> list[str]:
-    return [block.strip() for block in markdown.split("\n\n") if block]
+    return list(iter_blocks(io.StringIO(markdown)))
+
+def _iter_lines(source : Iterable[str] | mmap.mmap) -> Iterable[str]:
+    if isinstance(source, mmap.mmap):
+        return (line.decode("utf-8").replace("\r\n", "\n") for line in iter(source.readline, b""))
+    return source
+
+_FENCE_PATTERN = re.compile(r"```[^`]*")
+
+# A fence only opens on the first line of a block and only closes on a
+# bare ``` line. A fence still open at the end of the input was not a
+# code block, so the lines it swallowed are split into blocks again.
+def iter_blocks(source : Iterable[str] | mmap.mmap) -> Iterator[str]:
+    lines = []
+    in_fence = False
+    for line in _iter_lines(source):
+        stripped = line.strip()
+        if not stripped:
+            if not in_fence:
+                if lines:
+                    yield "".join(lines).strip()
+                    lines = []
+                continue
+        elif in_fence:
+            in_fence = stripped != "```"
+        elif not lines and _FENCE_PATTERN.fullmatch(stripped):
+            in_fence = True
+        lines.append(line)
+    if in_fence:
+        end = next((index for index, line in enumerate(lines) if not line.strip()), len(lines))
+        yield "".join(lines[:end]).strip()
+        yield from iter_blocks(lines[end:])
+    elif lines:
+        yield "".join(lines).strip()
+
+_HEADING_PATTERN = re.compile(r"#{1,6} [^\n]+")
+_CODE_PATTERN = re.compile(r"```[^\n]*\n.*```", re.DOTALL)
+
+# Yields the (start, end) offsets of every line without splitting the
+# block, so a block with a million lines is scanned in constant memory.
+def iter_line_bounds(block : str) -> Iterator[tuple[int, int]]:
+    start = 0
+    while True:
+        end = block.find("\n", start)
+        if end == -1:
+            yield start, len(block)
+            return
+        yield start, end
+        start = end + 1
+
+def _is_prefixed(block : str, prefix : str) -> bool:
+    for start, end in iter_line_bounds(block):
+        if end - start <= len(prefix) or not block.startswith(prefix, start):
+            return False
+    return True
+
+def _is_ordered_list(block : str) -> bool:
+    for index, (start, end) in enumerate(iter_line_bounds(block), 1):
+        prefix = f"{index}. "
+        if end - start <= len(prefix) or not block.startswith(prefix, start):
+            return False
+    return True
 
 def block_to_block_type(block : str) -> BlockType:
-    if re.fullmatch("#{1:6} .+", block):
-        return BlockType.HEADING
-    elif re.fullmatch("`{3}\n.+`{3}", block):
-        return BlockType.CODE
-    elif re.fullmatch("> [^\n]+(?:\n> [^\n]+)*", block):
-        return BlockType.QUOTE
-    elif re.fullmatch("- [^\n]+(?:\n- [^\n]+)*", block):
-        return BlockType.UNORDERED_LIST
-    elif re.fullmatch("(\d+)\. [^\n]+(?:\n(\d+)\. [^\n]+)*", block):
-        match_order_list = re.findall("^(\d+)\. [^\n]+", block, flags=re.MULTILINE)
-        for index in range(1, len(match_order_list) + 1):
-            if index != match_order_list[index - 1]:
-                return BlockType.PARAGRAPH
-        return BlockType.ORDERED_LIST
-    else:
-        return BlockType.PARAGRAPH
\ No newline at end of file
+    first_char = block[:1]
+    if first_char == "#":
+        if _HEADING_PATTERN.fullmatch(block):
+            return BlockType.HEADING
+    elif first_char == "`":
+        if _CODE_PATTERN.fullmatch(block):
+            return BlockType.CODE
+    elif first_char == ">":
+        if _is_prefixed(block, "> "):
+            return BlockType.QUOTE
+    elif first_char == "-":
+        if _is_prefixed(block, "- "):
+            return BlockType.UNORDERED_LIST
+    elif first_char == "1":
+        if _is_ordered_list(block):
+            return BlockType.ORDERED_LIST
+    return BlockType.PARAGRAPH
@@ -0,0 +1,416 @@
+import copy
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator
+
+import profiling
+from assets import AssetReport, asset_urls, rewrite_asset_urls, sync_assets
+from cache import LRUCache
+from diskcache import DiskCache
+from highlight import CachedHighlighter, Highlighter, highlight_cache_salt, load_highlighter
+from htmlnode import get_asset_urls, get_code_highlighter, set_asset_urls, set_code_highlighter
+from links import LinkIndex
+from page import BLOCK_CACHE_VERSION, PageCollector, extract_title, generate_page, get_block_cache, get_collector, get_inline_cache, set_block_cache, set_collector, set_inline_cache
+from search import SEARCH_DIR, build_search_index, page_terms
+from writer import OutputWriter, remove_output, write_file_atomic
+
+MANIFEST_VERSION = 1
+
+class BuildReport:
+    def __init__(self):
+        self.rendered : list[str] = []
+        self.skipped : list[str] = []
+        self.removed : list[str] = []
+        self.inline_cache_hits = 0
+        self.inline_cache_misses = 0
+        self.profile : profiling.BuildProfile = None
+        self.files_written = 0
+        self.files_unchanged = 0
+        self.bytes_written = 0
+        self.assets : AssetReport = None
+        self.block_cache_hits = 0
+        self.block_cache_misses = 0
+        self.block_cache_evicted = 0
+        self.block_cache_bytes = 0
+        self.links : LinkIndex = None
+        self.search_terms = 0
+        self.search_files = 0
+        self.search_bytes = 0
+        self.highlight_hits = 0
+        self.highlight_misses = 0
+        self.highlight_seconds = 0.0
+        self.highlight_evicted = 0
+        self.highlight_bytes = 0
+
+    def __repr__(self):
+        return f"BuildReport({len(self.rendered)} rendered, {len(self.skipped)} skipped, {len(self.removed)} removed)"
+
+def hash_bytes(data : bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def find_pages(content_dir : str) -> list[str]:
+    pages = []
+    for dir_path, dir_names, file_names in os.walk(content_dir):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            if file_name.endswith(".md"):
+                source = os.path.relpath(os.path.join(dir_path, file_name), content_dir)
+                pages.append(source.replace(os.sep, "/"))
+    return pages
+
+# Orders page paths the way find_pages() walks them: a directory's files
+# before its subdirectories.
+def page_sort_key(source : str) -> tuple:
+    parts = source.split("/")
+    return tuple((1, part) for part in parts[:-1]) + ((0, parts[-1]),)
+
+def shard_for(source : str, shards : int) -> int:
+    return int.from_bytes(hashlib.sha256(source.encode("utf-8")).digest()[:8], "big") % shards
+
+def shard_paths(shard_root : str, index : int) -> tuple[str, str]:
+    shard_dir = os.path.join(shard_root, str(index))
+    return os.path.join(shard_dir, "public"), os.path.join(shard_dir, "manifest.json")
+
+def output_path_for(source : str) -> str:
+    return source[:-len(".md")] + ".html"
+
+def empty_manifest() -> dict:
+    return {"version": MANIFEST_VERSION, "template": None, "pages": {}, "assets": {}}
+
+def load_manifest(manifest_path : str) -> dict:
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as file:
+            manifest = json.load(file)
+    except (FileNotFoundError, ValueError):
+        return empty_manifest()
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return empty_manifest()
+    if not isinstance(manifest.get("pages"), dict) or not isinstance(manifest.get("assets", {}), dict):
+        return empty_manifest()
+    return manifest
+
+def save_manifest(manifest_path : str, manifest : dict) -> None:
+    data = json.dumps(manifest, indent=2, sort_keys=True) + "\n"
+    write_file_atomic(manifest_path, data.encode("utf-8"))
+
+# highlighter is a spec for highlight.load_highlighter(); it is loaded in
+# every worker process rather than pickled with the options.
+class RenderOptions:
+    __slots__ = ("inline_cache_size", "profile", "trace", "asset_urls", "block_cache_dir", "block_cache_size", "search", "highlighter", "highlight_cache_dir", "highlight_cache_size")
+
+    def __init__(self, inline_cache_size : int = 0, profile : bool = False, trace : bool = False, asset_urls : dict[str, str] = None, block_cache_dir : str = None, block_cache_size : int = 0, search : bool = False,
+                 highlighter : str = None, highlight_cache_dir : str = None, highlight_cache_size : int = 0):
+        self.inline_cache_size = inline_cache_size
+        self.profile = profile or trace
+        self.trace = trace
+        self.asset_urls = asset_urls
+        self.block_cache_dir = block_cache_dir
+        self.block_cache_size = block_cache_size
+        self.search = search
+        self.highlighter = highlighter
+        self.highlight_cache_dir = highlight_cache_dir
+        self.highlight_cache_size = highlight_cache_size
+
+    def load_highlighter(self) -> Highlighter:
+        return load_highlighter(self.highlighter) if self.highlighter is not None else None
+
+    def highlighter_key(self) -> str:
+        highlighter = self.load_highlighter()
+        return highlight_cache_salt(highlighter) if highlighter is not None else ""
+
+    def block_cache(self) -> DiskCache:
+        if not self.block_cache_size:
+            return None
+        salt = f"blocks-v{BLOCK_CACHE_VERSION}:{json.dumps(self.asset_urls or {}, sort_keys=True)}:{self.highlighter_key()}"
+        return DiskCache(self.block_cache_dir, self.block_cache_size, salt)
+
+    def highlight_cache(self) -> DiskCache:
+        if self.highlighter is None or not self.highlight_cache_size:
+            return None
+        return DiskCache(self.highlight_cache_dir, self.highlight_cache_size, self.highlighter_key())
+
+    def code_highlighter(self) -> CachedHighlighter:
+        highlighter = self.load_highlighter()
+        return CachedHighlighter(highlighter, self.highlight_cache()) if highlighter is not None else None
+
+class RenderResult:
+    __slots__ = ("html", "inline_cache_hits", "inline_cache_misses", "block_cache_hits", "block_cache_misses", "profile", "links", "title", "terms", "highlight_hits", "highlight_misses", "highlight_seconds")
+
+    def __init__(self, html : str, inline_cache_hits : int = 0, inline_cache_misses : int = 0, profile : profiling.PageProfile = None, block_cache_hits : int = 0, block_cache_misses : int = 0, links : list[str] = None):
+        self.html = html
+        self.links = links if links is not None else []
+        self.title : str = None
+        self.terms : dict[str, int] = None
+        self.highlight_hits = 0
+        self.highlight_misses = 0
+        self.highlight_seconds = 0.0
+        self.inline_cache_hits = inline_cache_hits
+        self.inline_cache_misses = inline_cache_misses
+        self.block_cache_hits = block_cache_hits
+        self.block_cache_misses = block_cache_misses
+        self.profile = profile
+
+def _cache_counts(cache) -> tuple[int, int]:
+    return (cache.hits, cache.misses) if cache is not None else (0, 0)
+
+def render_page(source : str, markdown : str, template : str, search : bool = False) -> RenderResult:
+    inline_cache = get_inline_cache()
+    block_cache = get_block_cache()
+    highlighter = get_code_highlighter()
+    inline_hits, inline_misses = _cache_counts(inline_cache)
+    block_hits, block_misses = _cache_counts(block_cache)
+    highlight_hits, highlight_misses = _cache_counts(highlighter)
+    highlight_seconds = highlighter.seconds if highlighter is not None else 0.0
+    page_profile = None
+    collector = PageCollector(search)
+    previous_collector = get_collector()
+    set_collector(collector)
+    try:
+        if profiling.is_enabled():
+            with profiling.profile_page(source) as page_profile:
+                html = generate_page(markdown, template)
+        else:
+            html = generate_page(markdown, template)
+    finally:
+        set_collector(previous_collector)
+    inline_hits_after, inline_misses_after = _cache_counts(inline_cache)
+    block_hits_after, block_misses_after = _cache_counts(block_cache)
+    result = RenderResult(html, inline_hits_after - inline_hits, inline_misses_after - inline_misses, page_profile,
+                          block_hits_after - block_hits, block_misses_after - block_misses, collector.links)
+    if highlighter is not None:
+        result.highlight_hits = highlighter.hits - highlight_hits
+        result.highlight_misses = highlighter.misses - highlight_misses
+        result.highlight_seconds = highlighter.seconds - highlight_seconds
+    if search:
+        result.title = extract_title(markdown)
+        result.terms = page_terms(collector.texts, collector.headings)
+    return result
+
+def _apply_options(options : RenderOptions) -> None:
+    set_inline_cache(LRUCache(options.inline_cache_size) if options.inline_cache_size else None)
+    set_block_cache(options.block_cache())
+    set_asset_urls(options.asset_urls)
+    set_code_highlighter(options.code_highlighter())
+    if options.profile:
+        profiling.enable(options.trace)
+
+_worker_template : str = None
+_worker_search = False
+
+def _init_worker(template : str, options : RenderOptions) -> None:
+    global _worker_template, _worker_search
+    _worker_template = template
+    _worker_search = options.search
+    _apply_options(options)
+
+def _render_in_worker(page : tuple[str, str]) -> RenderResult:
+    return render_page(page[0], page[1], _worker_template, _worker_search)
+
+def default_chunksize(jobs : int, workers : int) -> int:
+    return max(1, jobs // (workers * 4))
+
+def render_pages(pages : Iterable[tuple[str, str]], template : str, workers : int = 1, chunksize : int = None, options : RenderOptions = None) -> Iterator[RenderResult]:
+    options = options or RenderOptions()
+    if workers <= 1:
+        previous_cache = get_inline_cache()
+        previous_urls = get_asset_urls()
+        previous_block_cache = get_block_cache()
+        previous_highlighter = get_code_highlighter()
+        was_profiling = profiling.is_enabled()
+        _apply_options(options)
+        try:
+            for source, markdown in pages:
+                yield render_page(source, markdown, template, options.search)
+        finally:
+            set_inline_cache(previous_cache)
+            set_asset_urls(previous_urls)
+            set_block_cache(previous_block_cache)
+            set_code_highlighter(previous_highlighter)
+            if not was_profiling:
+                profiling.disable()
+        return
+    pages = list(pages)
+    if chunksize is None:
+        chunksize = default_chunksize(len(pages), workers)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(template, options)) as pool:
+        yield from pool.map(_render_in_worker, pages, chunksize=chunksize)
+
+def _remove_search_index(public_dir : str, keep : Iterable[str] = ()) -> None:
+    search_dir = os.path.join(public_dir, SEARCH_DIR)
+    if os.path.isdir(search_dir):
+        for name in os.listdir(search_dir):
+            if name.endswith(".json") and name not in keep:
+                remove_output(public_dir, f"{SEARCH_DIR}/{name}")
+
+def _write_search_index(writer : OutputWriter, public_dir : str, pages : dict, report : BuildReport) -> None:
+    documents = [(f"/{entry['output']}", entry["title"], entry["terms"]) for entry in pages.values()]
+    files = build_search_index(documents)
+    search_dir = os.path.join(public_dir, SEARCH_DIR)
+    _remove_search_index(public_dir, files)
+    for name, data in files.items():
+        writer.submit(os.path.join(search_dir, name), data)
+        report.search_bytes += len(data)
+    report.search_terms = len({term for _, _, terms in documents for term in terms})
+    report.search_files = len(files)
+
+def _link_index(pages : dict, assets : dict) -> LinkIndex:
+    index = LinkIndex({entry["output"] for entry in pages.values()} | {entry["output"] for entry in assets.values()})
+    for entry in pages.values():
+        index.add_page(entry["output"], entry["links"])
+    return index
+
+def _remove_stale_outputs(public_dir : str, old_manifest : dict, pages : dict, report : BuildReport) -> None:
+    outputs = {entry["output"] for entry in pages.values()}
+    for source, entry in old_manifest["pages"].items():
+        if source not in pages and entry.get("output") not in outputs:
+            remove_output(public_dir, entry["output"])
+            report.removed.append(source)
+
+# shard is (index, count): only the pages that shard_for() assigns to
+# index are built, shard 0 also copies the static assets, and the link
+# and search indexes are left to merge_shards().
+def build_site(content_dir : str, template_path : str, public_dir : str, manifest_path : str = None, workers : int = 1, chunksize : int = None, options : RenderOptions = None, static_dir : str = None, fingerprint : bool = False, hard_link : bool = False, shard : tuple[int, int] = None) -> BuildReport:
+    options = options or RenderOptions()
+    old_manifest = load_manifest(manifest_path) if manifest_path is not None else empty_manifest()
+    report = BuildReport()
+    new_assets = {}
+    urls = {}
+    if static_dir is not None:
+        copy_files = shard is None or shard[0] == 0
+        new_assets, assets_report = sync_assets(static_dir, public_dir, old_manifest.get("assets", {}), fingerprint, hard_link, copy_files)
+        if copy_files:
+            report.assets = assets_report
+        urls = asset_urls(new_assets)
+        options = copy.copy(options)
+        options.asset_urls = urls
+
+    with open(template_path, "rb") as file:
+        template_data = file.read()
+    template = rewrite_asset_urls(template_data.decode("utf-8"), urls)
+    if urls:
+        template_data += json.dumps(urls, sort_keys=True).encode("utf-8")
+    if options.highlighter is not None:
+        template_data += options.highlighter_key().encode("utf-8")
+    template_hash = hash_bytes(template_data)
+
+    old_pages = old_manifest["pages"]
+    template_changed = old_manifest["template"] != template_hash
+    new_pages = {}
+    jobs = []
+    if options.profile:
+        report.profile = profiling.BuildProfile()
+
+    for source in find_pages(content_dir):
+        if shard is not None and shard_for(source, shard[1]) != shard[0]:
+            continue
+        with open(os.path.join(content_dir, source), "rb") as file:
+            source_data = file.read()
+        entry = {"hash": hash_bytes(source_data), "output": output_path_for(source)}
+        new_pages[source] = entry
+        output_path = os.path.join(public_dir, entry["output"])
+        old_entry = old_pages.get(source, {})
+        if (not template_changed and old_entry.get("hash") == entry["hash"] and old_entry.get("output") == entry["output"]
+                and isinstance(old_entry.get("links"), list) and (not options.search or isinstance(old_entry.get("terms"), dict))
+                and os.path.exists(output_path)):
+            entry["links"] = old_entry["links"]
+            if options.search:
+                entry["title"] = old_entry.get("title")
+                entry["terms"] = old_entry["terms"]
+            report.skipped.append(source)
+            continue
+        jobs.append((source, source_data.decode("utf-8"), output_path))
+
+    results = render_pages(((source, markdown) for source, markdown, _ in jobs), template, workers, chunksize, options)
+    with OutputWriter() as writer:
+        for (source, _, output_path), result in zip(jobs, results):
+            writer.submit(output_path, result.html.encode("utf-8"))
+            report.rendered.append(source)
+            new_pages[source]["links"] = result.links
+            if result.terms is not None:
+                new_pages[source]["title"] = result.title
+                new_pages[source]["terms"] = result.terms
+            report.inline_cache_hits += result.inline_cache_hits
+            report.inline_cache_misses += result.inline_cache_misses
+            report.block_cache_hits += result.block_cache_hits
+            report.block_cache_misses += result.block_cache_misses
+            report.highlight_hits += result.highlight_hits
+            report.highlight_misses += result.highlight_misses
+            report.highlight_seconds += result.highlight_seconds
+            if result.profile is not None:
+                report.profile.add(result.profile)
+        if options.search and shard is None:
+            _write_search_index(writer, public_dir, new_pages, report)
+        elif shard is None:
+            _remove_search_index(public_dir)
+    report.files_written = writer.files_written
+    report.files_unchanged = writer.files_skipped
+    report.bytes_written = writer.bytes_written
+    block_cache = options.block_cache()
+    if block_cache is not None:
+        report.block_cache_evicted = block_cache.evict()
+        report.block_cache_bytes = block_cache.disk_usage()
+    highlight_cache = options.highlight_cache()
+    if highlight_cache is not None:
+        report.highlight_evicted = highlight_cache.evict()
+        report.highlight_bytes = highlight_cache.disk_usage()
+
+    if shard is None:
+        report.links = _link_index(new_pages, new_assets)
+    _remove_stale_outputs(public_dir, old_manifest, new_pages, report)
+
+    if manifest_path is not None:
+        manifest = {"version": MANIFEST_VERSION, "template": template_hash, "pages": new_pages, "assets": new_assets}
+        if shard is not None:
+            manifest["shard"] = list(shard)
+        save_manifest(manifest_path, manifest)
+    return report
+
+def _read_bytes(path : str) -> bytes:
+    with open(path, "rb") as file:
+        return file.read()
+
+def merge_shards(shard_root : str, shards : int, public_dir : str, manifest_path : str = None) -> BuildReport:
+    old_manifest = load_manifest(manifest_path) if manifest_path is not None else empty_manifest()
+    report = BuildReport()
+    template_hash = None
+    pages = {}
+    assets = {}
+    with OutputWriter() as writer:
+        for index in range(shards):
+            shard_public, shard_manifest_path = shard_paths(shard_root, index)
+            manifest = load_manifest(shard_manifest_path)
+            if manifest.get("shard") != [index, shards]:
+                raise ValueError(f"Shard {index} of {shards} missing")
+            if index == 0:
+                template_hash = manifest["template"]
+                assets = manifest["assets"]
+                for entry in assets.values():
+                    writer.submit(os.path.join(public_dir, entry["output"]), _read_bytes(os.path.join(shard_public, entry["output"])))
+            elif manifest["template"] != template_hash:
+                raise ValueError("Shards built with different templates or assets")
+            for source, entry in manifest["pages"].items():
+                if source in pages:
+                    raise ValueError("Page built by more than one shard")
+                pages[source] = entry
+                writer.submit(os.path.join(public_dir, entry["output"]), _read_bytes(os.path.join(shard_public, entry["output"])))
+        pages = dict(sorted(pages.items(), key=lambda item: page_sort_key(item[0])))
+        report.skipped = list(pages)
+        if pages and all(isinstance(entry.get("terms"), dict) for entry in pages.values()):
+            _write_search_index(writer, public_dir, pages, report)
+        else:
+            _remove_search_index(public_dir)
+    report.files_written = writer.files_written
+    report.files_unchanged = writer.files_skipped
+    report.bytes_written = writer.bytes_written
+    report.links = _link_index(pages, assets)
+    _remove_stale_outputs(public_dir, old_manifest, pages, report)
+    asset_outputs = {entry["output"] for entry in assets.values()}
+    for entry in old_manifest.get("assets", {}).values():
+        if entry.get("output") not in asset_outputs:
+            remove_output(public_dir, entry["output"])
+
+    if manifest_path is not None:
+        save_manifest(manifest_path, {"version": MANIFEST_VERSION, "template": template_hash, "pages": pages, "assets": assets})
+    return report
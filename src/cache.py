@@ -0,0 +1,53 @@
+from collections import OrderedDict
+from collections.abc import Hashable
+
+class LRUCache:
+    def __init__(self, max_size : int):
+        if max_size < 1:
+            raise ValueError("Cache size must be positive")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key : Hashable, default = None):
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key : Hashable, value) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key : Hashable):
+        return key in self._entries
+
+    def __repr__(self):
+        return f"LRUCache({len(self._entries)}/{self.max_size} entries, {self.hits} hits, {self.misses} misses)"
+
+def format_bytes(size : int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+def format_hit_rate(name : str, hits : int, misses : int) -> str:
+    lookups = hits + misses
+    rate = hits / lookups * 100 if lookups else 0.0
+    return f"{name}: {hits} hits, {misses} misses ({rate:.1f}% hit rate)"
@@ -0,0 +1,26 @@
+import sys
+
+USAGE = "usage: convert.py [--template PATH] < page.md > page.html"
+
+# Imports stay inside main() so short invocations only pay for the
+# modules that the conversion actually needs.
+def main(argv : list[str]) -> int:
+    template_path = None
+    if argv[:1] == ["--template"] and len(argv) == 2:
+        template_path = argv[1]
+    elif argv:
+        print(USAGE, file=sys.stderr)
+        return 2
+    if template_path is None:
+        from page import write_markdown_html
+        write_markdown_html(sys.stdin, sys.stdout)
+        sys.stdout.write("\n")
+        return 0
+    from page import generate_page
+    with open(template_path, "r", encoding="utf-8") as file:
+        template = file.read()
+    sys.stdout.write(generate_page(sys.stdin.read(), template))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,75 @@
+import hashlib
+import os
+
+from writer import write_file_atomic
+
+class DiskCache:
+    def __init__(self, directory : str, max_bytes : int, salt : str = ""):
+        if max_bytes < 1:
+            raise ValueError("Cache size must be positive")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.salt = salt
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, text : str) -> str:
+        return hashlib.sha256(f"{self.salt}\0{text}".encode("utf-8")).hexdigest()
+
+    def _path(self, key : str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    def get(self, key : str, default = None):
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                value = file.read()
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def put(self, key : str, value : str) -> None:
+        write_file_atomic(self._path(key), value.encode("utf-8"))
+
+    def _entries(self) -> list[tuple[int, int, str]]:
+        entries = []
+        try:
+            shards = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return entries
+        for shard in shards:
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.startswith("."):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return entries
+
+    def disk_usage(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> int:
+        entries = self._entries()
+        usage = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if usage <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            usage -= size
+            evicted += 1
+        return evicted
+
+    def __repr__(self):
+        return f"DiskCache({self.directory}, {self.hits} hits, {self.misses} misses)"
@@ -0,0 +1,116 @@
+import functools
+import importlib
+import time
+
+from diskcache import DiskCache
+from htmlnode import escape_text
+
+HIGHLIGHT_CACHE_VERSION = 2
+
+# A highlighter turns code into the HTML written inside <code>. Subclasses
+# override highlight(); name and version are part of every cache key, so
+# a highlighter whose output changes must change its version.
+class Highlighter:
+    name = "plain"
+    version = "1"
+
+    def highlight(self, code : str, language : str) -> str:
+        return escape_text(code)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name} {self.version})"
+
+class PygmentsHighlighter(Highlighter):
+    name = "pygments"
+
+    def __init__(self):
+        try:
+            import pygments
+            from pygments.formatters import HtmlFormatter
+            from pygments.lexers import TextLexer, get_lexer_by_name
+            from pygments.util import ClassNotFound
+        except ImportError:
+            raise ValueError("Pygments is not installed") from None
+        self.version = pygments.__version__
+        self.formatter = HtmlFormatter(nowrap=True)
+        self.lexers = {"": TextLexer()}
+        self._highlight = pygments.highlight
+        self._get_lexer = get_lexer_by_name
+        self._class_not_found = ClassNotFound
+
+    def lexer(self, language : str):
+        lexer = self.lexers.get(language)
+        if lexer is None:
+            try:
+                lexer = self._get_lexer(language)
+            except self._class_not_found:
+                lexer = self.lexers[""]
+            self.lexers[language] = lexer
+        return lexer
+
+    # Pygments always ends its output with a newline; inline code has none.
+    def highlight(self, code : str, language : str) -> str:
+        html = self._highlight(code, self.lexer(language), self.formatter)
+        if not code.endswith("\n") and html.endswith("\n"):
+            html = html[:-1]
+        return html
+
+HIGHLIGHTERS = {
+    "plain": Highlighter,
+    "pygments": PygmentsHighlighter,
+}
+
+# spec is a name from HIGHLIGHTERS or "module:attribute" naming a
+# Highlighter subclass or instance. Loaded once per process.
+@functools.cache
+def load_highlighter(spec : str) -> Highlighter:
+    if spec in HIGHLIGHTERS:
+        return HIGHLIGHTERS[spec]()
+    module_name, _, attribute = spec.partition(":")
+    if not module_name or not attribute:
+        raise ValueError(f"Unknown highlighter: {spec}")
+    try:
+        highlighter = getattr(importlib.import_module(module_name), attribute)
+    except (ImportError, AttributeError):
+        raise ValueError(f"Unknown highlighter: {spec}") from None
+    if isinstance(highlighter, type):
+        highlighter = highlighter()
+    if not isinstance(highlighter, Highlighter):
+        raise ValueError(f"Not a highlighter: {spec}")
+    return highlighter
+
+def highlight_cache_salt(highlighter : Highlighter) -> str:
+    return f"highlight-v{HIGHLIGHT_CACHE_VERSION}:{highlighter.name}:{highlighter.version}"
+
+# The hook installed with htmlnode.set_code_highlighter(). Highlighted
+# code is kept on disk keyed by the highlighter's version, the language
+# and the code, so a snippet is only highlighted again when one of them
+# changes. The cache may be shared by every worker process of a build.
+class CachedHighlighter:
+    __slots__ = ("highlighter", "cache", "hits", "misses", "seconds")
+
+    def __init__(self, highlighter : Highlighter, cache : DiskCache = None):
+        self.highlighter = highlighter
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+        self.seconds = 0.0
+
+    def __call__(self, code : str, language : str) -> str:
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(f"{language}\n{code}")
+            html = self.cache.get(key)
+            if html is not None:
+                self.hits += 1
+                return html
+        self.misses += 1
+        start = time.perf_counter()
+        html = self.highlighter.highlight(code, language)
+        self.seconds += time.perf_counter() - start
+        if key is not None:
+            self.cache.put(key, html)
+        return html
+
+    def __repr__(self):
+        return f"CachedHighlighter({self.highlighter}, {self.hits} hits, {self.misses} misses)"
@@ -1,6 +1,91 @@
-from textnode import TextNode, TextType
+import io
+from collections.abc import Callable, Hashable, Iterator
+
+from cache import LRUCache
+from textnode import TEXT_TYPE_CODES, InlineTokens, TextNode, TextType
+
+FRAGMENT_CACHE_SIZE = 1024
+ATTRIBUTE_CACHE_SIZE = 4096
+ESCAPE_CHUNK_SIZE = 64 * 1024
+
+_asset_urls : dict[str, str] = {}
+_fragment_cache = LRUCache(FRAGMENT_CACHE_SIZE)
+_escaped_attributes : dict[str, str] = {}
+_rendered_props : dict[tuple, str] = {}
+_code_highlighter : Callable[[str, str], str] = None
+
+def get_asset_urls() -> dict[str, str]:
+    return _asset_urls
+
+def set_asset_urls(urls : dict[str, str]) -> None:
+    global _asset_urls
+    urls = urls or {}
+    if urls != _asset_urls:
+        _fragment_cache.clear()
+    _asset_urls = urls
+
+def get_code_highlighter() -> Callable[[str, str], str]:
+    return _code_highlighter
+
+# highlighter(code, language) returns the HTML written inside <code> for
+# code blocks and inline code; language is "" for inline code.
+def set_code_highlighter(highlighter : Callable[[str, str], str]) -> None:
+    global _code_highlighter
+    if highlighter is not _code_highlighter:
+        _fragment_cache.clear()
+    _code_highlighter = highlighter
+
+def _escape_attribute(value : str) -> str:
+    if "&" in value or "<" in value or ">" in value or "\"" in value or "'" in value:
+        return value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace("\"", "&quot;").replace("'", "&#x27;")
+    return value
+
+# Escaped values and rendered prop dicts are memoized, since the same
+# hrefs and classes repeat on every page. When a memo is full its newest
+# entry makes room, so values seen early (navigation, shared assets)
+# stay cached and eviction costs O(1).
+def escape_attribute(value) -> str:
+    if type(value) is not str:
+        return _escape_attribute(str(value))
+    escaped = _escaped_attributes.get(value)
+    if escaped is None:
+        escaped = _escape_attribute(value)
+        if len(_escaped_attributes) >= ATTRIBUTE_CACHE_SIZE:
+            _escaped_attributes.popitem()
+        _escaped_attributes[value] = escaped
+    return escaped
+
+def escape_text(value : str) -> str:
+    if "&" in value or "<" in value or ">" in value:
+        return value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return value
+
+# Escapes source[start:end] a chunk at a time, so a huge code block is
+# never copied or escaped as a whole.
+def write_escaped(source : str, start : int, end : int, write : Callable[[str], object]) -> None:
+    while start < end:
+        stop = min(start + ESCAPE_CHUNK_SIZE, end)
+        write(escape_text(source[start:stop]))
+        start = stop
+
+def render_props(props : dict) -> str:
+    if not props:
+        return ""
+    key = tuple(props.items())
+    try:
+        props_html = _rendered_props.get(key)
+    except TypeError:
+        return "".join([f" {name}=\"{escape_attribute(value)}\"" for name, value in props.items()])
+    if props_html is None:
+        props_html = "".join([f" {name}=\"{escape_attribute(value)}\"" for name, value in props.items()])
+        if len(_rendered_props) >= ATTRIBUTE_CACHE_SIZE:
+            _rendered_props.popitem()
+        _rendered_props[key] = props_html
+    return props_html
 
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag = None, value = None, children = None, props = None):
         self.tag : str = tag
         self.value : str = value
@@ -8,55 +93,214 @@ class HTMLNode:
         self.props : dict = props
 
     def to_html(self) -> str:
+        sink = io.StringIO()
+        self.write_html(sink)
+        return sink.getvalue()
+
+    def iter_html(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def write_html(self, sink : io.TextIOBase) -> None:
+        self._write_html(sink.write)
+
+    def _write_html(self, write : Callable[[str], object]) -> None:
         raise NotImplementedError
     
     def props_to_html(self) -> str:
-        html_value = ""
-        if self.props is not None:
-            for key, value in self.props.items():
-                html_value += f" {key}=\"{value}\""
-        return html_value
+        return render_props(self.props)
     
     def __repr__(self):
         return f"HTMLNode({self.tag}, {self.value}, {self.children}, {self.props})"
     
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag : str, value : str, props : dict = None):
-        super().__init__()
         self.tag = tag
         self.value = value
+        self.children = None
         self.props = props
 
-    def to_html(self) -> str:
+    def iter_html(self) -> Iterator[str]:
         if self.value is None:
             raise ValueError("Value missing")
         if self.tag is None:
-            return self.value
-        return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+            yield self.value
+            return
+        yield f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+
+    def _write_html(self, write : Callable[[str], object]) -> None:
+        if self.value is None:
+            raise ValueError("Value missing")
+        if self.tag is None:
+            write(self.value)
+        else:
+            write(f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>")
     
     def __repr__(self):
         return f"LeafNode({self.tag}, {self.value}, {self.props})"
     
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag : str, children : list[HTMLNode], props : dict = None):
-        super().__init__()
         self.tag = tag
+        self.value = None
         self.children = children
         self.props = props
 
-    def to_html(self) -> str:
+    def iter_html(self) -> Iterator[str]:
+        open_tag, close_tag, children = self._open()
+        yield open_tag
+        stack = [(close_tag, children)]
+        while stack:
+            close_tag, children = stack[-1]
+            for child in children:
+                if isinstance(child, ParentNode):
+                    open_tag, child_close_tag, grandchildren = child._open()
+                    yield open_tag
+                    stack.append((child_close_tag, grandchildren))
+                    break
+                yield from child.iter_html()
+            else:
+                stack.pop()
+                yield close_tag
+
+    def _write_html(self, write : Callable[[str], object]) -> None:
+        open_tag, close_tag, children = self._open()
+        write(open_tag)
+        stack = [(close_tag, children)]
+        while stack:
+            close_tag, children = stack[-1]
+            for child in children:
+                if isinstance(child, ParentNode):
+                    open_tag, child_close_tag, grandchildren = child._open()
+                    write(open_tag)
+                    stack.append((child_close_tag, grandchildren))
+                    break
+                child._write_html(write)
+            else:
+                stack.pop()
+                write(close_tag)
+
+    def _open(self) -> tuple[str, str, Iterator[HTMLNode]]:
         if self.tag is None:
             raise ValueError("Tag missing")
         if self.children is None:
             raise ValueError("Children missing")
-        children_html = ""
-        for child in self.children:
-            children_html += child.to_html()
-        return f"<{self.tag}{self.props_to_html()}>{children_html}</{self.tag}>"
+        return f"<{self.tag}{self.props_to_html()}>", f"</{self.tag}>", iter(self.children)
     
     def __repr__(self):
         return f"ParentNode({self.tag}, {self.children}, {self.props})"
     
+class InlineNode(HTMLNode):
+    __slots__ = ("tokens",)
+
+    def __init__(self, tokens : InlineTokens):
+        self.tag = None
+        self.value = None
+        self.children = None
+        self.props = None
+        self.tokens = tokens
+
+    def iter_html(self) -> Iterator[str]:
+        chunks = []
+        write_tokens_html(self.tokens, chunks.append)
+        yield from chunks
+
+    def _write_html(self, write : Callable[[str], object]) -> None:
+        write_tokens_html(self.tokens, write)
+
+    def __repr__(self):
+        return f"InlineNode({self.tokens})"
+
+class CodeBlockNode(HTMLNode):
+    __slots__ = ("source", "start", "end", "language")
+
+    def __init__(self, source : str, start : int = 0, end : int = None, language : str = ""):
+        self.tag = "pre"
+        self.value = None
+        self.children = None
+        self.props = None
+        self.source = source
+        self.start = start
+        self.end = len(source) if end is None else end
+        self.language = language
+
+    def open_html(self) -> str:
+        if self.language:
+            return f"<pre><code class=\"language-{escape_attribute(self.language)}\">"
+        return "<pre><code>"
+
+    def iter_html(self) -> Iterator[str]:
+        yield self.open_html()
+        if _code_highlighter is not None:
+            yield _code_highlighter(self.source[self.start:self.end], self.language)
+        else:
+            chunks = []
+            for start in range(self.start, self.end, ESCAPE_CHUNK_SIZE):
+                write_escaped(self.source, start, min(start + ESCAPE_CHUNK_SIZE, self.end), chunks.append)
+                yield chunks.pop()
+        yield "</code></pre>"
+
+    def _write_html(self, write : Callable[[str], object]) -> None:
+        write(self.open_html())
+        if _code_highlighter is not None:
+            write(_code_highlighter(self.source[self.start:self.end], self.language))
+        else:
+            write_escaped(self.source, self.start, self.end, write)
+        write("</code></pre>")
+
+    def __repr__(self):
+        return f"CodeBlockNode({self.end - self.start} chars)"
+
+# A frozen subtree is rendered once per key and written as the cached
+# string afterwards. The key stands for everything the subtree is built
+# from, so a change to those inputs must change the key; build is only
+# called when the key is not cached.
+class FrozenNode(HTMLNode):
+    __slots__ = ("key", "build")
+
+    def __init__(self, key : Hashable, build : Callable[[], HTMLNode]):
+        self.tag = None
+        self.value = None
+        self.children = None
+        self.props = None
+        self.key = key
+        self.build = build
+
+    def render(self) -> str:
+        html = _fragment_cache.get(self.key)
+        if html is None:
+            html = self.build().to_html()
+            _fragment_cache.put(self.key, html)
+        return html
+
+    def iter_html(self) -> Iterator[str]:
+        yield self.render()
+
+    def _write_html(self, write : Callable[[str], object]) -> None:
+        write(self.render())
+
+    def __repr__(self):
+        return f"FrozenNode({self.key})"
+
+def freeze(node : HTMLNode, key : Hashable) -> FrozenNode:
+    return FrozenNode(key, lambda: node)
+
+def get_fragment_cache() -> LRUCache:
+    return _fragment_cache
+
+def count_nodes(node : HTMLNode) -> int:
+    count = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        count += 1
+        if node.children is not None:
+            stack.extend(node.children)
+    return count
+
 def text_node_to_html_node(text_node : TextNode) -> LeafNode:
     match text_node.text_type:
         case TextType.TEXT:
@@ -66,9 +310,66 @@ def text_node_to_html_node(text_node : TextNode) -> LeafNode:
         case TextType.ITALIC:
             return LeafNode("i", text_node.text)
         case TextType.CODE:
+            if _code_highlighter is not None:
+                return LeafNode("code", _code_highlighter(text_node.text, ""))
             return LeafNode("code", text_node.text)
         case TextType.LINK:
-            return LeafNode("a", text_node.text, {'href': text_node.url})
+            return LeafNode("a", text_node.text, {'href': _asset_urls.get(text_node.url, text_node.url)})
         case TextType.IMAGE:
-            return LeafNode("img", "", {'src': text_node.url, 'alt': text_node.text})
-    raise ValueError("Text node must have a valid type")
\ No newline at end of file
+            return LeafNode("img", "", {'src': _asset_urls.get(text_node.url, text_node.url), 'alt': text_node.text})
+    raise ValueError("Text node must have a valid type")
+
+_TEXT_CODE = TEXT_TYPE_CODES[TextType.TEXT]
+_LINK_CODE = TEXT_TYPE_CODES[TextType.LINK]
+_IMAGE_CODE = TEXT_TYPE_CODES[TextType.IMAGE]
+_CODE_CODE = TEXT_TYPE_CODES[TextType.CODE]
+_TOKEN_TAGS = {
+    TEXT_TYPE_CODES[TextType.BOLD]: "b",
+    TEXT_TYPE_CODES[TextType.ITALIC]: "i",
+    TEXT_TYPE_CODES[TextType.CODE]: "code",
+}
+
+def tokens_to_html_nodes(tokens : InlineTokens) -> list[LeafNode]:
+    source = tokens.source
+    urls = _asset_urls
+    html_nodes = []
+    for index, (code, start, end, url_index) in enumerate(zip(tokens.types, tokens.starts, tokens.ends, tokens.url_indexes)):
+        if code == _TEXT_CODE:
+            html_nodes.append(LeafNode(None, source[start:end]))
+        elif code == _LINK_CODE:
+            url = tokens.url(index)
+            html_nodes.append(LeafNode("a", source[start:end], {"href": urls.get(url, url)}))
+        elif code == _IMAGE_CODE:
+            url = tokens.url(index)
+            html_nodes.append(LeafNode("img", "", {"src": urls.get(url, url), "alt": source[start:end]}))
+        elif code == _CODE_CODE and _code_highlighter is not None:
+            html_nodes.append(LeafNode("code", _code_highlighter(source[start:end], "")))
+        else:
+            html_nodes.append(LeafNode(_TOKEN_TAGS[code], source[start:end]))
+    return html_nodes
+
+def token_urls(tokens : InlineTokens) -> list[str]:
+    source = tokens.source
+    urls = _asset_urls
+    return [urls.get(url, url) for url in (source[start:end] for start, end in zip(tokens.url_starts, tokens.url_ends))]
+
+def write_tokens_html(tokens : InlineTokens, write : Callable[[str], object]) -> None:
+    source = tokens.source
+    url_starts = tokens.url_starts
+    url_ends = tokens.url_ends
+    urls = _asset_urls
+    highlighter = _code_highlighter
+    for code, start, end, url_index in zip(tokens.types, tokens.starts, tokens.ends, tokens.url_indexes):
+        if code == _TEXT_CODE:
+            write(source[start:end])
+        elif code == _LINK_CODE:
+            url = source[url_starts[url_index]:url_ends[url_index]]
+            write(f"<a href=\"{escape_attribute(urls.get(url, url))}\">{source[start:end]}</a>")
+        elif code == _IMAGE_CODE:
+            url = source[url_starts[url_index]:url_ends[url_index]]
+            write(f"<img src=\"{escape_attribute(urls.get(url, url))}\" alt=\"{escape_attribute(source[start:end])}\"></img>")
+        elif code == _CODE_CODE and highlighter is not None:
+            write(f"<code>{highlighter(source[start:end], '')}</code>")
+        else:
+            tag = _TOKEN_TAGS[code]
+            write(f"<{tag}>{source[start:end]}</{tag}>")
@@ -0,0 +1,59 @@
+import posixpath
+
+class LinkIndex:
+    def __init__(self, targets : set[str]):
+        self.targets = targets
+        self.internal = 0
+        self.external = 0
+        self.dangling : list[tuple[str, str]] = []
+        self.backlinks : dict[str, set[str]] = {}
+
+    def add_page(self, output : str, links : list[str]) -> None:
+        for url in links:
+            target = resolve_link(output, url)
+            if target is None:
+                self.external += 1
+                continue
+            self.internal += 1
+            resolved = find_target(target, self.targets)
+            if resolved is None:
+                self.dangling.append((output, url))
+            elif resolved != output:
+                self.backlinks.setdefault(resolved, set()).add(output)
+
+    def most_linked(self, count : int) -> list[tuple[str, int]]:
+        counts = sorted(((target, len(pages)) for target, pages in self.backlinks.items()), key=lambda item: (-item[1], item[0]))
+        return counts[:count]
+
+    def format_report(self, top : int = 10) -> str:
+        lines = [f"Dangling links: {len(self.dangling)}"]
+        for output, url in self.dangling:
+            lines.append(f"  {output} -> {url}")
+        linked = self.most_linked(top)
+        lines.append(f"Most linked {len(linked)} of {len(self.backlinks)} targets:")
+        for target, count in linked:
+            lines.append(f"  {count:>6} pages  {target}")
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return f"LinkIndex({self.internal} internal, {self.external} external, {len(self.dangling)} dangling)"
+
+def resolve_link(output : str, url : str) -> str:
+    if not url or url.startswith(("#", "//")) or ":" in url.split("/", 1)[0]:
+        return None
+    path = url.split("#", 1)[0].split("?", 1)[0]
+    if not path:
+        return None
+    if path.startswith("/"):
+        resolved = path.lstrip("/")
+    else:
+        resolved = posixpath.join(posixpath.dirname(output), path)
+    if path.endswith("/"):
+        resolved = posixpath.join(resolved, "index.html")
+    return posixpath.normpath(resolved)
+
+def find_target(target : str, targets : set[str]) -> str:
+    for candidate in (target, f"{target}.html", f"{target}/index.html"):
+        if candidate in targets:
+            return candidate
+    return None
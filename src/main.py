@@ -1,8 +1,58 @@
-from textnode import TextNode, TextType
+import argparse
+import os
+
+from build import RenderOptions, build_site
+from cache import format_bytes, format_hit_rate
 
 def main():
-    first_el = TextNode("This is some anchor text", TextType.LINK, "https://www.boot.dev")
-    print(first_el)
+    arg_parser = argparse.ArgumentParser(description="Build the static site from markdown content.")
+    arg_parser.add_argument("--content", default="content", help="directory of markdown pages")
+    arg_parser.add_argument("--template", default="template.html", help="HTML page template")
+    arg_parser.add_argument("--public", default="public", help="output directory")
+    arg_parser.add_argument("--static", default="static", help="directory of static assets copied into the output")
+    arg_parser.add_argument("--fingerprint", action="store_true", help="name assets after their content hash and rewrite URLs to them")
+    arg_parser.add_argument("--hard-link", action="store_true", help="hard-link assets into the output instead of copying them")
+    arg_parser.add_argument("--incremental", action="store_true", help="only re-render pages whose source or template changed")
+    arg_parser.add_argument("--manifest", default=".build/manifest.json", help="manifest used by incremental builds")
+    arg_parser.add_argument("--workers", type=int, default=1, help="render pages in this many processes (0 uses every CPU)")
+    arg_parser.add_argument("--chunksize", type=int, default=None, help="pages sent to a worker per task")
+    arg_parser.add_argument("--inline-cache", type=int, default=0, metavar="SIZE", help="cache up to SIZE rendered inline fragments per process")
+    arg_parser.add_argument("--block-cache", type=int, default=0, metavar="MB", help="keep up to MB megabytes of rendered blocks on disk between builds")
+    arg_parser.add_argument("--block-cache-dir", default=".build/blocks", help="directory of the block cache")
+    arg_parser.add_argument("--highlight", metavar="HIGHLIGHTER", help="highlight code with a highlighter: plain, pygments or module:attribute")
+    arg_parser.add_argument("--highlight-cache", type=int, default=64, metavar="MB", help="keep up to MB megabytes of highlighted code on disk between builds (0 disables)")
+    arg_parser.add_argument("--highlight-cache-dir", default=".build/highlight", help="directory of the highlight cache")
+    arg_parser.add_argument("--links", type=int, nargs="?", const=10, default=None, metavar="N", help="list dangling links and the N most linked pages (default 10)")
+    arg_parser.add_argument("--search", action="store_true", help="write a sharded search index to public/search/")
+    arg_parser.add_argument("--profile", type=int, nargs="?", const=10, default=None, metavar="N", help="time each pipeline stage and print the N slowest pages (default 10)")
+    arg_parser.add_argument("--trace", metavar="PATH", help="write per-stage timings as a Chrome trace JSON file")
+    args = arg_parser.parse_args()
 
-main()
+    workers = args.workers or os.cpu_count()
+    options = RenderOptions(args.inline_cache, args.profile is not None, args.trace is not None,
+                            block_cache_dir=args.block_cache_dir, block_cache_size=args.block_cache * 1024 * 1024, search=args.search,
+                            highlighter=args.highlight, highlight_cache_dir=args.highlight_cache_dir, highlight_cache_size=args.highlight_cache * 1024 * 1024)
+    report = build_site(args.content, args.template, args.public, args.manifest if args.incremental else None, workers, args.chunksize, options, args.static, args.fingerprint, args.hard_link)
+    print(report)
+    print(report.assets)
+    print(report.links)
+    print(f"Wrote {report.files_written} file(s), {report.bytes_written} bytes; {report.files_unchanged} unchanged")
+    if args.inline_cache:
+        print(format_hit_rate("Inline cache", report.inline_cache_hits, report.inline_cache_misses))
+    if args.block_cache:
+        print(f"{format_hit_rate('Block cache', report.block_cache_hits, report.block_cache_misses)}, "
+              f"{format_bytes(report.block_cache_bytes)} on disk, {report.block_cache_evicted} evicted")
+    if args.highlight is not None:
+        print(f"{format_hit_rate('Highlight cache', report.highlight_hits, report.highlight_misses)}, "
+              f"{report.highlight_seconds * 1000:.1f} ms highlighting, {format_bytes(report.highlight_bytes)} on disk, {report.highlight_evicted} evicted")
+    if args.search:
+        print(f"Search index: {report.search_terms} terms in {report.search_files} files, {format_bytes(report.search_bytes)}")
+    if args.links is not None:
+        print(report.links.format_report(args.links))
+    if args.profile is not None:
+        print(report.profile.format_report(args.profile))
+    if args.trace is not None:
+        report.profile.write_chrome_trace(args.trace)
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+import io
+import mmap
+from collections.abc import Callable, Iterable, Iterator
+
+from block import BlockType, block_to_block_type, iter_blocks, iter_line_bounds, markdown_to_blocks
+from cache import LRUCache
+from htmlnode import CodeBlockNode, HTMLNode, InlineNode, LeafNode, ParentNode, token_urls, write_tokens_html
+from parser import text_to_tokens
+from search import token_texts
+from textnode import InlineTokens
+
+BLOCK_CACHE_VERSION = 6
+
+_inline_cache : LRUCache = None
+# DiskCache is named only in annotations: importing diskcache would load
+# hashlib and the output writer on the convert.py path.
+_block_cache : "DiskCache" = None
+
+class PageCollector:
+    __slots__ = ("links", "texts", "headings")
+
+    def __init__(self, search : bool = False):
+        self.links : list[str] = []
+        self.texts : list[str] = [] if search else None
+        self.headings : list[str] = [] if search else None
+
+    def add_tokens(self, tokens : InlineTokens) -> None:
+        if tokens.url_starts:
+            self.links.extend(token_urls(tokens))
+        if self.texts is not None:
+            self.texts.extend(token_texts(tokens))
+
+    def add(self, links : list[str], texts : list[str], headings : list[str] = ()) -> None:
+        self.links.extend(links)
+        if self.texts is not None:
+            self.texts.extend(texts)
+            self.headings.extend(headings)
+
+_collector : PageCollector = None
+
+def get_inline_cache() -> LRUCache:
+    return _inline_cache
+
+def set_inline_cache(cache : LRUCache) -> None:
+    global _inline_cache
+    _inline_cache = cache
+
+def get_block_cache() -> "DiskCache":
+    return _block_cache
+
+def set_block_cache(cache : "DiskCache") -> None:
+    global _block_cache
+    _block_cache = cache
+
+def get_collector() -> PageCollector:
+    return _collector
+
+def set_collector(collector : PageCollector) -> None:
+    global _collector
+    _collector = collector
+
+def cached_inline_html(text : str) -> str:
+    entry = _inline_cache.get(text)
+    if entry is None:
+        tokens = text_to_tokens(text)
+        entry = (InlineNode(tokens).to_html(), token_urls(tokens), token_texts(tokens))
+        _inline_cache.put(text, entry)
+    if _collector is not None:
+        _collector.add(entry[1], entry[2])
+    return entry[0]
+
+def text_to_children(text : str) -> list[HTMLNode]:
+    if _inline_cache is None:
+        tokens = text_to_tokens(text)
+        if _collector is not None:
+            _collector.add_tokens(tokens)
+        return [InlineNode(tokens)]
+    return [LeafNode(None, cached_inline_html(text))]
+
+def write_inline_html(text : str, write : Callable[[str], object]) -> None:
+    if _inline_cache is not None:
+        write(cached_inline_html(text))
+        return
+    tokens = text_to_tokens(text)
+    if _collector is not None:
+        _collector.add_tokens(tokens)
+    write_tokens_html(tokens, write)
+
+# Items are parsed one line at a time while the list is written, so a
+# list of any length renders without a node per item. Links and prose
+# are collected when the list is rendered rather than when it is built.
+# markdown_to_html_node() renders each block as it is built while a
+# collector is set, so they are still collected in document order.
+class ListBlockNode(HTMLNode):
+    __slots__ = ("block",)
+
+    def __init__(self, tag : str, block : str):
+        self.tag = tag
+        self.value = None
+        self.children = None
+        self.props = None
+        self.block = block
+
+    def iter_items(self) -> Iterator[str]:
+        block = self.block
+        for start, end in iter_line_bounds(block):
+            yield block[block.index(" ", start, end) + 1:end]
+
+    def iter_html(self) -> Iterator[str]:
+        yield f"<{self.tag}>"
+        chunks = []
+        for text in self.iter_items():
+            chunks.append("<li>")
+            write_inline_html(text, chunks.append)
+            chunks.append("</li>")
+            yield "".join(chunks)
+            chunks.clear()
+        yield f"</{self.tag}>"
+
+    def _write_html(self, write : Callable[[str], object]) -> None:
+        write(f"<{self.tag}>")
+        for text in self.iter_items():
+            write("<li>")
+            write_inline_html(text, write)
+            write("</li>")
+        write(f"</{self.tag}>")
+
+    def __repr__(self):
+        return f"ListBlockNode({self.tag}, {len(self.block)} chars)"
+
+def block_inline_texts(block : str, block_type : BlockType) -> list[str]:
+    match block_type:
+        case BlockType.HEADING:
+            return [block.lstrip("#")[1:]]
+        case BlockType.CODE:
+            return []
+        case BlockType.QUOTE:
+            return [" ".join([line.lstrip(">").strip() for line in block.split("\n")])]
+        case BlockType.UNORDERED_LIST | BlockType.ORDERED_LIST:
+            return [line.split(" ", 1)[1] for line in block.split("\n")]
+        case BlockType.PARAGRAPH:
+            return [" ".join(block.split("\n"))]
+    raise ValueError("Block must have a valid type")
+
+def block_to_html_node(block : str) -> HTMLNode:
+    block_type = block_to_block_type(block)
+    match block_type:
+        case BlockType.CODE:
+            start = block.index("\n") + 1
+            return CodeBlockNode(block, start, len(block) - 3, block[3:start].strip())
+        case BlockType.UNORDERED_LIST:
+            return ListBlockNode("ul", block)
+        case BlockType.ORDERED_LIST:
+            return ListBlockNode("ol", block)
+    texts = block_inline_texts(block, block_type)
+    match block_type:
+        case BlockType.HEADING:
+            if _collector is None or _collector.texts is None:
+                children = text_to_children(texts[0])
+            else:
+                count = len(_collector.texts)
+                children = text_to_children(texts[0])
+                _collector.headings.extend(_collector.texts[count:])
+                del _collector.texts[count:]
+            return ParentNode(f"h{len(block) - len(block.lstrip('#'))}", children)
+        case BlockType.QUOTE:
+            return ParentNode("blockquote", text_to_children(texts[0]))
+    return ParentNode("p", text_to_children(texts[0]))
+
+# A block cache entry is a JSON list of the block's link targets, prose
+# and headings on the first line followed by its HTML.
+def cached_block_html(block : str, cache : "DiskCache") -> str:
+    global _collector
+    import json
+    key = cache.key(block)
+    entry = cache.get(key)
+    if entry is None:
+        collector, _collector = _collector, PageCollector(search=True)
+        try:
+            html = block_to_html_node(block).to_html()
+            links, texts, headings = _collector.links, _collector.texts, _collector.headings
+        finally:
+            _collector = collector
+        cache.put(key, f"{json.dumps([links, texts, headings])}\n{html}")
+    else:
+        collected, _, html = entry.partition("\n")
+        links, texts, headings = json.loads(collected)
+    if _collector is not None:
+        _collector.add(links, texts, headings)
+    return html
+
+def markdown_to_html_node(markdown : str) -> ParentNode:
+    if _block_cache is None:
+        if _collector is not None:
+            return ParentNode("div", [LeafNode(None, block_to_html_node(block).to_html()) for block in markdown_to_blocks(markdown)])
+        return ParentNode("div", [block_to_html_node(block) for block in markdown_to_blocks(markdown)])
+    return ParentNode("div", [LeafNode(None, cached_block_html(block, _block_cache)) for block in markdown_to_blocks(markdown)])
+
+def write_markdown_html(source : Iterable[str] | mmap.mmap, sink : io.TextIOBase) -> None:
+    sink.write("<div>")
+    for block in iter_blocks(source):
+        if _block_cache is None:
+            block_to_html_node(block).write_html(sink)
+        else:
+            sink.write(cached_block_html(block, _block_cache))
+    sink.write("</div>")
+
+def extract_title(markdown : str) -> str:
+    for line in markdown.split("\n"):
+        if line.startswith("# "):
+            return line[2:].strip()
+    raise ValueError("Title missing")
+
+def generate_page(markdown : str, template : str) -> str:
+    content = markdown_to_html_node(markdown).to_html()
+    return template.replace("{{ Title }}", extract_title(markdown)).replace("{{ Content }}", content)
@@ -1,4 +1,4 @@
-from textnode import TextNode, TextType
+from textnode import TEXT_TYPE_CODES, InlineTokens, TextNode, TextType
 import re
 
 def split_nodes_delimiter(old_nodes : list[TextNode], delimiter : str, text_type : TextType) -> list[TextNode]:
@@ -17,54 +17,105 @@ def split_nodes_delimiter(old_nodes : list[TextNode], delimiter : str, text_type
                 result_node_list.append(TextNode(sub_node_text, text_type))
     return result_node_list
 
+_IMAGE_PATTERN = re.compile(r"\!\[([^\]]+)\]\(([^\)]+)\)")
+_LINK_PATTERN = re.compile(r"(?<!\!)\[([^\]]+)\]\(([^\)]+)\)")
+_ANY_LINK_PATTERN = re.compile(r"\[([^\]]+)\]\(([^\)]+)\)")
+
 def extract_markdown_images(text : str) -> list[tuple[str]]:
-    return re.findall(r"\!\[([^\]]+)\]\(([^\)]+)\)", text)
+    return _IMAGE_PATTERN.findall(text)
 
 def extract_markdown_link(text : str) -> list[tuple[str]]:
-    return re.findall(r"\[([^\]]+)\]\(([^\)]+)\)", text)
+    return _ANY_LINK_PATTERN.findall(text)
 
-def split_nodes_link(old_nodes : list[TextNode]) -> list[TextNode]:
+def _split_nodes_pattern(old_nodes : list[TextNode], pattern : re.Pattern, text_type : TextType) -> list[TextNode]:
     result_node_list = []
     for old_node in old_nodes:
         if old_node.text_type != TextType.TEXT:
             result_node_list.append(old_node)
             continue
         text = old_node.text
-        while len(text) > 0:
-            match_text = re.search(r"(?<!\!)\[([^\]]+)\]\(([^\)]+)\)", text)
-            if match_text is not None:
-                result_node_list.append(TextNode(text[:match_text.start()], old_node.text_type))
-                result_node_list.append(TextNode(match_text.group(1), TextType.LINK, match_text.group(2)))
-                text = text[match_text.end():]
-            else:
-                result_node_list.append(TextNode(text, old_node.text_type))
-                text = ""
+        position = 0
+        for match_text in pattern.finditer(text):
+            if match_text.start() > position:
+                result_node_list.append(TextNode(text[position:match_text.start()], old_node.text_type))
+            result_node_list.append(TextNode(match_text.group(1), text_type, match_text.group(2)))
+            position = match_text.end()
+        if position < len(text):
+            result_node_list.append(TextNode(text[position:], old_node.text_type))
     return result_node_list
 
+def split_nodes_link(old_nodes : list[TextNode]) -> list[TextNode]:
+    return _split_nodes_pattern(old_nodes, _LINK_PATTERN, TextType.LINK)
+
 def split_nodes_image(old_nodes : list[TextNode]) -> list[TextNode]:
-    result_node_list = []
-    for old_node in old_nodes:
-        if old_node.text_type != TextType.TEXT:
-            result_node_list.append(old_node)
-            continue
-        text = old_node.text
-        while len(text) > 0:
-            match_text = re.search(r"\!\[([^\]]+)\]\(([^\)]+)\)", text)
-            if match_text is not None:
-                result_node_list.append(TextNode(text[:match_text.start()], old_node.text_type))
-                result_node_list.append(TextNode(match_text.group(1), TextType.IMAGE, match_text.group(2)))
-                text = text[match_text.end():]
+    return _split_nodes_pattern(old_nodes, _IMAGE_PATTERN, TextType.IMAGE)
+
+INLINE_DELIMITERS = {
+    "**": TextType.BOLD,
+    "_": TextType.ITALIC,
+    "`": TextType.CODE,
+}
+
+_INLINE_TOKEN = re.compile(r"\*\*|[_`]|!?\[")
+
+_TEXT_CODE = TEXT_TYPE_CODES[TextType.TEXT]
+_LINK_CODE = TEXT_TYPE_CODES[TextType.LINK]
+_IMAGE_CODE = TEXT_TYPE_CODES[TextType.IMAGE]
+_DELIMITER_CODES = {token: TEXT_TYPE_CODES[text_type] for token, text_type in INLINE_DELIMITERS.items()}
+
+def text_to_tokens(text : str) -> InlineTokens:
+    tokens = InlineTokens(text)
+    append_type = tokens.types.append
+    append_start = tokens.starts.append
+    append_end = tokens.ends.append
+    append_url = tokens.url_indexes.append
+    text_start = 0
+    position = 0
+    while True:
+        match_token = _INLINE_TOKEN.search(text, position)
+        if match_token is None:
+            break
+        token = match_token.group()
+        start = match_token.start()
+        code = _DELIMITER_CODES.get(token)
+        if code is not None:
+            content_start = start + len(token)
+            end = text.find(token, content_start)
+            if end == -1:
+                raise ValueError("Missing closing delimiter")
+            position = end + len(token)
+            url_index = -1
+        else:
+            if token == "[":
+                match_span = _LINK_PATTERN.match(text, start)
+                code = _LINK_CODE
             else:
-                result_node_list.append(TextNode(text, old_node.text_type))
-                text = ""
-    return result_node_list
+                match_span = _IMAGE_PATTERN.match(text, start)
+                code = _IMAGE_CODE
+            if match_span is None:
+                position = match_token.end()
+                continue
+            position = match_span.end()
+            content_start, end = match_span.span(1)
+            url_index = len(tokens.url_starts)
+            tokens.url_starts.append(match_span.start(2))
+            tokens.url_ends.append(match_span.end(2))
+        if start > text_start:
+            append_type(_TEXT_CODE)
+            append_start(text_start)
+            append_end(start)
+            append_url(-1)
+        append_type(code)
+        append_start(content_start)
+        append_end(end)
+        append_url(url_index)
+        text_start = position
+    if text_start < len(text):
+        append_type(_TEXT_CODE)
+        append_start(text_start)
+        append_end(len(text))
+        append_url(-1)
+    return tokens
 
 def text_to_textnodes(text : str) -> list[TextNode]:
-    nodes = [TextNode(text, TextType.TEXT)]
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
-    return nodes
-
+    return text_to_tokens(text).to_textnodes()
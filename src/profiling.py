@@ -0,0 +1,157 @@
+import functools
+import importlib
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from htmlnode import HTMLNode, count_nodes
+
+def _count_one(result, args) -> int:
+    return 1
+
+def _count_result(result, args) -> int:
+    return len(result)
+
+def _count_tree(result, args) -> int:
+    return count_nodes(args[0])
+
+# (module, function, node counter) for every instrumented pipeline stage
+STAGES = [
+    ("block", "markdown_to_blocks", _count_result),
+    ("block", "block_to_block_type", _count_one),
+    ("parser", "text_to_textnodes", _count_result),
+    ("parser", "text_to_tokens", _count_result),
+    ("parser", "split_nodes_delimiter", _count_result),
+    ("parser", "split_nodes_image", _count_result),
+    ("parser", "split_nodes_link", _count_result),
+]
+
+class PageProfile:
+    __slots__ = ("page", "pid", "start", "seconds", "stages", "events")
+
+    def __init__(self, page : str, trace : bool = False):
+        self.page = page
+        self.pid = os.getpid()
+        self.start = 0.0
+        self.seconds = 0.0
+        self.stages : dict[str, list] = {}
+        self.events : list[tuple] = [] if trace else None
+
+    def record(self, stage : str, start : float, seconds : float, nodes : int) -> None:
+        totals = self.stages.get(stage)
+        if totals is None:
+            self.stages[stage] = [1, seconds, nodes]
+        else:
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] += nodes
+        if self.events is not None:
+            self.events.append((stage, start, seconds))
+
+    def __repr__(self):
+        return f"PageProfile({self.page}, {self.seconds * 1000:.2f} ms)"
+
+_current : PageProfile = None
+_trace = False
+_patches : list[tuple] = []
+
+def is_enabled() -> bool:
+    return bool(_patches)
+
+def _wrap(stage : str, func : Callable, counter : Callable) -> Callable:
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profile = _current
+        if profile is None:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        profile.record(stage, start, time.perf_counter() - start, counter(result, args))
+        return result
+    return wrapper
+
+def _patch(owner, name : str, replacement) -> None:
+    _patches.append((owner, name, vars(owner)[name]))
+    setattr(owner, name, replacement)
+
+# Stages are wrapped by rebinding the functions in every module that
+# imported them, so a build with profiling off runs the original code.
+def enable(trace : bool = False) -> None:
+    global _trace
+    _trace = trace
+    if _patches:
+        return
+    for module_name, name, counter in STAGES:
+        original = getattr(importlib.import_module(module_name), name)
+        wrapper = _wrap(name, original, counter)
+        for module in list(sys.modules.values()):
+            if vars(module).get(name) is original:
+                _patch(module, name, wrapper)
+    _patch(HTMLNode, "to_html", _wrap("to_html", HTMLNode.to_html, _count_tree))
+
+def disable() -> None:
+    global _trace
+    _trace = False
+    while _patches:
+        owner, name, original = _patches.pop()
+        setattr(owner, name, original)
+
+@contextmanager
+def profile_page(page : str) -> Iterator[PageProfile]:
+    global _current
+    profile = PageProfile(page, _trace)
+    previous, _current = _current, profile
+    profile.start = time.perf_counter()
+    try:
+        yield profile
+    finally:
+        profile.seconds = time.perf_counter() - profile.start
+        _current = previous
+
+class BuildProfile:
+    def __init__(self):
+        self.pages : list[PageProfile] = []
+
+    def add(self, profile : PageProfile) -> None:
+        self.pages.append(profile)
+
+    def stage_totals(self) -> dict[str, list]:
+        totals = {}
+        for profile in self.pages:
+            for stage, (calls, seconds, nodes) in profile.stages.items():
+                stage_totals = totals.setdefault(stage, [0, 0.0, 0])
+                stage_totals[0] += calls
+                stage_totals[1] += seconds
+                stage_totals[2] += nodes
+        return totals
+
+    def slowest_pages(self, count : int) -> list[PageProfile]:
+        return sorted(self.pages, key=lambda profile: profile.seconds, reverse=True)[:count]
+
+    def format_report(self, top : int = 10) -> str:
+        lines = [f"Slowest {min(top, len(self.pages))} of {len(self.pages)} pages:"]
+        for profile in self.slowest_pages(top):
+            lines.append(f"  {profile.seconds * 1000:9.2f} ms  {profile.page}")
+            for stage, (calls, seconds, nodes) in sorted(profile.stages.items(), key=lambda item: -item[1][1]):
+                lines.append(f"      {stage:<22} {seconds * 1000:9.2f} ms  {calls:>7} calls  {nodes:>8} nodes")
+        lines.append("Stages:")
+        for stage, (calls, seconds, nodes) in sorted(self.stage_totals().items(), key=lambda item: -item[1][1]):
+            lines.append(f"  {stage:<24} {seconds * 1000:9.2f} ms  {calls:>7} calls  {nodes:>8} nodes")
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> dict:
+        events = []
+        for profile in self.pages:
+            events.append({"name": profile.page, "cat": "page", "ph": "X", "pid": profile.pid, "tid": 0,
+                           "ts": profile.start * 1e6, "dur": profile.seconds * 1e6})
+            for stage, start, seconds in profile.events or ():
+                events.append({"name": stage, "cat": "stage", "ph": "X", "pid": profile.pid, "tid": 0,
+                               "ts": start * 1e6, "dur": seconds * 1e6, "args": {"page": profile.page}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path : str) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.chrome_trace(), file)
@@ -0,0 +1,74 @@
+import re
+
+from textnode import TEXT_TYPE_CODES, InlineTokens, TextType
+
+SEARCH_INDEX_VERSION = 1
+SEARCH_DIR = "search"
+SHARD_BYTES = 32 * 1024
+HEADING_WEIGHT = 5
+MIN_TERM_LENGTH = 2
+
+_PROSE_CODES = frozenset(TEXT_TYPE_CODES[text_type] for text_type in (TextType.TEXT, TextType.BOLD, TextType.ITALIC, TextType.LINK))
+_WORD_PATTERN = re.compile(r"[^\W_]+")
+_json_encoder = None
+
+def token_texts(tokens : InlineTokens) -> list[str]:
+    source = tokens.source
+    return [source[start:end] for code, start, end in zip(tokens.types, tokens.starts, tokens.ends) if code in _PROSE_CODES]
+
+def page_terms(texts : list[str], headings : list[str]) -> dict[str, int]:
+    terms = {}
+    for chunks, weight in ((texts, 1), (headings, HEADING_WEIGHT)):
+        for word in _WORD_PATTERN.findall(" ".join(chunks).lower()):
+            if len(word) >= MIN_TERM_LENGTH:
+                terms[word] = terms.get(word, 0) + weight
+    return terms
+
+# json is imported on first use: page.py imports this module for
+# token_texts() on the convert.py path, which never writes an index.
+def _dump(value) -> bytes:
+    global _json_encoder
+    if _json_encoder is None:
+        import json
+        _json_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    return _json_encoder.encode(value).encode("utf-8")
+
+# documents are (url, title, terms) tuples; the result maps file names to
+# their contents. Terms are split into shards of about shard_bytes in
+# sorted order, and index.json lists the first term of every shard so a
+# client fetches only the shard its query falls into.
+def build_search_index(documents : list[tuple[str, str, dict[str, int]]], shard_bytes : int = SHARD_BYTES) -> dict[str, bytes]:
+    postings = {}
+    for document, (_, _, terms) in enumerate(documents):
+        for term, weight in terms.items():
+            postings.setdefault(term, []).append((weight, document))
+    shards = []
+    shard = {}
+    size = 1
+    for term in sorted(postings):
+        flat = []
+        for weight, document in sorted(postings[term], key=lambda posting: (-posting[0], posting[1])):
+            flat.append(document)
+            flat.append(weight)
+        entry_size = len(_dump(term)) + len(_dump(flat)) + 2
+        if shard and size + entry_size > shard_bytes:
+            shards.append(shard)
+            shard = {}
+            size = 1
+        shard[term] = flat
+        size += entry_size
+    if shard:
+        shards.append(shard)
+
+    files = {}
+    table = []
+    for number, shard in enumerate(shards):
+        name = f"terms-{number}.json"
+        files[name] = _dump(shard)
+        table.append([next(iter(shard)), name])
+    files["index.json"] = _dump({
+        "version": SEARCH_INDEX_VERSION,
+        "documents": [[url, title] for url, title, _ in documents],
+        "shards": table,
+    })
+    return files
@@ -0,0 +1,80 @@
+import argparse
+import os
+import subprocess
+import sys
+
+from build import RenderOptions, build_site, merge_shards, shard_paths
+
+def build_shard(args : argparse.Namespace, index : int) -> None:
+    public_dir, manifest_path = shard_paths(args.root, index)
+    workers = args.workers or os.cpu_count()
+    options = RenderOptions(search=args.search, highlighter=args.highlight, highlight_cache_dir=args.highlight_cache_dir, highlight_cache_size=args.highlight_cache * 1024 * 1024)
+    report = build_site(args.content, args.template, public_dir, manifest_path, workers, options=options,
+                        static_dir=args.static, fingerprint=args.fingerprint, shard=(index, args.count))
+    print(f"Shard {index} of {args.count}: {report}")
+
+def merge(args : argparse.Namespace) -> None:
+    report = merge_shards(args.root, args.count, args.public, args.manifest)
+    print(f"Merged {len(report.skipped)} pages from {args.count} shards, removed {len(report.removed)}")
+    print(report.links)
+    print(f"Wrote {report.files_written} file(s), {report.bytes_written} bytes; {report.files_unchanged} unchanged")
+    if args.links is not None:
+        print(report.links.format_report(args.links))
+
+def shard_command(args : argparse.Namespace, index : int) -> list[str]:
+    command = [sys.executable, os.path.abspath(__file__), "build", str(index), str(args.count),
+               "--content", args.content, "--template", args.template, "--static", args.static,
+               "--root", args.root, "--workers", str(args.workers)]
+    if args.fingerprint:
+        command.append("--fingerprint")
+    if args.search:
+        command.append("--search")
+    if args.highlight is not None:
+        command.extend(["--highlight", args.highlight, "--highlight-cache", str(args.highlight_cache), "--highlight-cache-dir", args.highlight_cache_dir])
+    return command
+
+def main() -> int:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--content", default="content", help="directory of markdown pages")
+    common.add_argument("--template", default="template.html", help="HTML page template")
+    common.add_argument("--static", default="static", help="directory of static assets copied into the output")
+    common.add_argument("--fingerprint", action="store_true", help="name assets after their content hash and rewrite URLs to them")
+    common.add_argument("--search", action="store_true", help="collect search terms and write the index when merging")
+    common.add_argument("--highlight", metavar="HIGHLIGHTER", help="highlight code with a highlighter: plain, pygments or module:attribute")
+    common.add_argument("--highlight-cache", type=int, default=64, metavar="MB", help="keep up to MB megabytes of highlighted code on disk between builds (0 disables)")
+    common.add_argument("--highlight-cache-dir", default=".build/highlight", help="directory of the highlight cache, shared by every shard")
+    common.add_argument("--workers", type=int, default=1, help="render pages of a shard in this many processes (0 uses every CPU)")
+    common.add_argument("--root", default=".build/shards", help="directory holding one output directory and manifest per shard")
+    merging = argparse.ArgumentParser(add_help=False)
+    merging.add_argument("--public", default="public", help="output directory of the merged site")
+    merging.add_argument("--manifest", default=".build/manifest.json", help="manifest of the merged site")
+    merging.add_argument("--links", type=int, nargs="?", const=10, default=None, metavar="N", help="list dangling links and the N most linked pages (default 10)")
+
+    arg_parser = argparse.ArgumentParser(description="Build the site in shards and merge them into one output directory.")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", parents=[common], help="build shard INDEX of COUNT")
+    build_parser.add_argument("index", type=int)
+    build_parser.add_argument("count", type=int)
+    merge_parser = commands.add_parser("merge", parents=[common, merging], help="merge COUNT built shards")
+    merge_parser.add_argument("count", type=int)
+    local_parser = commands.add_parser("local", parents=[common, merging], help="build COUNT shards in parallel processes and merge them")
+    local_parser.add_argument("count", type=int)
+    args = arg_parser.parse_args()
+
+    if args.count < 1:
+        arg_parser.error("the shard count must be positive")
+    if args.command == "build":
+        if not 0 <= args.index < args.count:
+            arg_parser.error("the shard index must be between 0 and COUNT - 1")
+        build_shard(args, args.index)
+        return 0
+    if args.command == "local":
+        processes = [subprocess.Popen(shard_command(args, index)) for index in range(args.count)]
+        if any([process.wait() != 0 for process in processes]):
+            print("A shard failed to build", file=sys.stderr)
+            return 1
+    merge(args)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+
+from assets import asset_urls, find_assets, fingerprint_name, hash_file, rewrite_asset_urls, sync_assets
+
+class TestAssets(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.static = os.path.join(self.temp_dir.name, "static")
+        self.public = os.path.join(self.temp_dir.name, "public")
+        self.write(os.path.join(self.static, "styles.css"), b"body {}")
+        self.write(os.path.join(self.static, "images", "logo.png"), b"\x89PNG")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as file:
+            file.write(data)
+
+    def read(self, path):
+        with open(path, "rb") as file:
+            return file.read()
+
+    def test_find_assets(self):
+        self.assertEqual(find_assets(self.static), ["styles.css", "images/logo.png"])
+        self.assertEqual(find_assets(os.path.join(self.temp_dir.name, "missing")), [])
+
+    def test_fingerprint_name(self):
+        self.assertEqual(fingerprint_name("styles.css", "0123456789abcdef"), "styles.01234567.css")
+        self.assertEqual(fingerprint_name("images/logo.min.png", "0123456789abcdef"), "images/logo.min.01234567.png")
+        self.assertEqual(fingerprint_name("LICENSE", "0123456789abcdef"), "LICENSE.01234567")
+        self.assertEqual(fingerprint_name(".htaccess", "0123456789abcdef"), ".htaccess.01234567")
+
+    def test_copies_assets(self):
+        assets, report = sync_assets(self.static, self.public, {})
+        self.assertEqual(report.copied, ["styles.css", "images/logo.png"])
+        self.assertEqual(report.bytes_copied, 11)
+        self.assertEqual(self.read(os.path.join(self.public, "images", "logo.png")), b"\x89PNG")
+        self.assertEqual(assets["styles.css"]["hash"], hash_file(os.path.join(self.static, "styles.css")))
+        self.assertEqual(asset_urls(assets), {})
+
+    def test_skips_unchanged_assets(self):
+        sync_assets(self.static, self.public, {})
+        _, report = sync_assets(self.static, self.public, {})
+        self.assertEqual(report.copied, [])
+        self.assertEqual(report.unchanged, 2)
+
+    def test_copies_changed_asset(self):
+        assets, _ = sync_assets(self.static, self.public, {})
+        self.write(os.path.join(self.static, "styles.css"), b"body { color: red }")
+        _, report = sync_assets(self.static, self.public, assets)
+        self.assertEqual(report.copied, ["styles.css"])
+        self.assertEqual(self.read(os.path.join(self.public, "styles.css")), b"body { color: red }")
+
+    def test_removes_deleted_asset(self):
+        assets, _ = sync_assets(self.static, self.public, {})
+        os.remove(os.path.join(self.static, "images", "logo.png"))
+        _, report = sync_assets(self.static, self.public, assets)
+        self.assertEqual(report.removed, ["images/logo.png"])
+        self.assertFalse(os.path.exists(os.path.join(self.public, "images")))
+
+    def test_fingerprint(self):
+        assets, _ = sync_assets(self.static, self.public, {}, fingerprint=True)
+        output = assets["styles.css"]["output"]
+        self.assertRegex(output, r"^styles\.[0-9a-f]{8}\.css$")
+        self.assertEqual(asset_urls(assets)["/styles.css"], f"/{output}")
+        self.write(os.path.join(self.static, "styles.css"), b"p {}")
+        new_assets, report = sync_assets(self.static, self.public, assets, fingerprint=True)
+        self.assertEqual(report.copied, ["styles.css"])
+        self.assertEqual(report.removed, [output])
+        self.assertFalse(os.path.exists(os.path.join(self.public, output)))
+        self.assertTrue(os.path.exists(os.path.join(self.public, new_assets["styles.css"]["output"])))
+
+    def test_hard_link(self):
+        sync_assets(self.static, self.public, {}, hard_link=True)
+        self.assertTrue(os.path.samefile(os.path.join(self.static, "styles.css"), os.path.join(self.public, "styles.css")))
+
+    def test_rewrite_asset_urls(self):
+        html = '<link rel="stylesheet" href="/styles.css" /><img src="/logo.png"><a href="/other.css">'
+        self.assertEqual(
+            rewrite_asset_urls(html, {"/styles.css": "/styles.abc.css", "/logo.png": "/logo.def.png"}),
+            '<link rel="stylesheet" href="/styles.abc.css" /><img src="/logo.def.png"><a href="/other.css">',
+        )
+        self.assertIs(rewrite_asset_urls(html, {}), html)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,25 @@
+import unittest
+
+from benchmark import CORPORA, find_regressions, make_corpus, time_stages
+
+class TestBenchmark(unittest.TestCase):
+    def test_make_corpus(self):
+        for kind in CORPORA:
+            corpus = make_corpus(kind, 2000)
+            self.assertGreaterEqual(len(corpus), 2000 - 2)
+
+    def test_time_stages(self):
+        results = time_stages(make_corpus("lists", 3000), 1)
+        self.assertEqual(list(results), ["markdown_to_blocks", "block_to_block_type", "text_to_textnodes", "text_node_to_html_node", "text_to_tokens", "to_html"])
+        self.assertEqual(results["markdown_to_blocks"]["nodes"], 1)
+        self.assertEqual(results["text_to_textnodes"]["nodes"], 800)
+        self.assertGreater(results["to_html"]["mb_per_s"], 0)
+
+    def test_find_regressions(self):
+        baseline = {"corpora": {"prose": {"to_html": {"seconds": 0.010}, "markdown_to_blocks": {"seconds": 0.0001}}}}
+        current = {"corpora": {"prose": {"to_html": {"seconds": 0.013}, "markdown_to_blocks": {"seconds": 0.001}}, "code": {"to_html": {"seconds": 1.0}}}}
+        self.assertEqual(find_regressions(baseline, current, 0.2), ["prose/to_html: 30% slower (10.00 ms -> 13.00 ms)"])
+        self.assertEqual(find_regressions(baseline, current, 0.5), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,9 @@
+import io
+import mmap
+import tempfile
 import unittest
 
-from block import markdown_to_blocks
+from block import BlockType, block_to_block_type, iter_blocks, iter_line_bounds, markdown_to_blocks
 
 class TestBlock(unittest.TestCase):
     def test_markdown_to_blocks(self):
@@ -45,5 +48,89 @@ This is the same paragraph on a new line
             ],
         )
 
+    def test_markdown_to_blocks_fenced_code(self):
+        md = "Intro\n\n```\nfirst\n\n\nsecond\n```\n\nOutro"
+        self.assertEqual(markdown_to_blocks(md), ["Intro", "```\nfirst\n\n\nsecond\n```", "Outro"])
+
+    def test_markdown_to_blocks_inline_triple_backticks(self):
+        md = "```x``` starts this line\n\nSecond para\n\n# Heading"
+        self.assertEqual(markdown_to_blocks(md), ["```x``` starts this line", "Second para", "# Heading"])
+        md = "Intro\n```\n\nSecond para"
+        self.assertEqual(markdown_to_blocks(md), ["Intro\n```", "Second para"])
+
+    def test_markdown_to_blocks_unclosed_fence(self):
+        md = "```python\ncode\n\nSecond para\n\n# Heading"
+        self.assertEqual(markdown_to_blocks(md), ["```python\ncode", "Second para", "# Heading"])
+        self.assertEqual(markdown_to_blocks("```\n\n"), ["```"])
+
+    def test_markdown_to_blocks_whitespace_line(self):
+        self.assertEqual(markdown_to_blocks("  first\n   \nsecond  \n"), ["first", "second"])
+
+    def test_iter_blocks_file(self):
+        source = io.StringIO("# Title\n\nSome text\nmore text\n \n\n- item")
+        self.assertEqual(list(iter_blocks(source)), ["# Title", "Some text\nmore text", "- item"])
+
+    def test_iter_blocks_mmap(self):
+        with tempfile.TemporaryFile() as file:
+            file.write("Caf\u00e9\r\n\r\n```\ncode\r\n\r\nmore\r\n```\r\n".encode("utf-8"))
+            file.flush()
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                self.assertEqual(list(iter_blocks(mapped)), ["Caf\u00e9", "```\ncode\n\nmore\n```"])
+
+    def test_iter_blocks_is_lazy(self):
+        def lines():
+            yield "first\n"
+            yield "\n"
+            raise AssertionError("read past the first block")
+        self.assertEqual(next(iter_blocks(lines())), "first")
+
+class TestBlockToBlockType(unittest.TestCase):
+    def test_heading(self):
+        self.assertEqual(block_to_block_type("# Title"), BlockType.HEADING)
+        self.assertEqual(block_to_block_type("###### Smallest"), BlockType.HEADING)
+
+    def test_heading_invalid(self):
+        self.assertEqual(block_to_block_type("####### Too deep"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("#No space"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("# Title\nsecond line"), BlockType.PARAGRAPH)
+
+    def test_code(self):
+        self.assertEqual(block_to_block_type("```\nprint('hi')\n```"), BlockType.CODE)
+        self.assertEqual(block_to_block_type("```python\nx = 1\n\ny = 2\n```"), BlockType.CODE)
+
+    def test_code_unclosed(self):
+        self.assertEqual(block_to_block_type("```\nprint('hi')"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("`inline` code"), BlockType.PARAGRAPH)
+
+    def test_quote(self):
+        self.assertEqual(block_to_block_type("> quoted\n> text"), BlockType.QUOTE)
+        self.assertEqual(block_to_block_type("> quoted\nnot quoted"), BlockType.PARAGRAPH)
+
+    def test_unordered_list(self):
+        self.assertEqual(block_to_block_type("- one\n- two"), BlockType.UNORDERED_LIST)
+        self.assertEqual(block_to_block_type("- one\ntwo"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("- one\n- "), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("\n".join(["- item"] * 100000)), BlockType.UNORDERED_LIST)
+
+    def test_iter_line_bounds(self):
+        block = "ab\n\ncd"
+        self.assertEqual([block[start:end] for start, end in iter_line_bounds(block)], ["ab", "", "cd"])
+        self.assertEqual(list(iter_line_bounds("")), [(0, 0)])
+
+    def test_ordered_list(self):
+        self.assertEqual(block_to_block_type("1. one\n2. two\n3. three"), BlockType.ORDERED_LIST)
+        block = "\n".join(f"{index}. item" for index in range(1, 12))
+        self.assertEqual(block_to_block_type(block), BlockType.ORDERED_LIST)
+
+    def test_ordered_list_invalid(self):
+        self.assertEqual(block_to_block_type("1. one\n3. three"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("2. two\n3. three"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("1. one\n2."), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("1) one"), BlockType.PARAGRAPH)
+
+    def test_paragraph(self):
+        self.assertEqual(block_to_block_type("Just some text\non two lines"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type(""), BlockType.PARAGRAPH)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
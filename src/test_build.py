@@ -0,0 +1,323 @@
+import json
+import os
+import tempfile
+import unittest
+
+from build import MANIFEST_VERSION, RenderOptions, build_site, default_chunksize, load_manifest, merge_shards, page_sort_key, render_pages, shard_for, shard_paths
+
+class TestBuild(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+        self.content = os.path.join(self.root, "content")
+        self.public = os.path.join(self.root, "public")
+        self.template = os.path.join(self.root, "template.html")
+        self.manifest = os.path.join(self.root, ".build", "manifest.json")
+        self.write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome")
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Post\n\nHello")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+
+    def read(self, path):
+        with open(path, encoding="utf-8") as file:
+            return file.read()
+
+    def build(self):
+        return build_site(self.content, self.template, self.public, self.manifest)
+
+    def test_full_build(self):
+        report = build_site(self.content, self.template, self.public)
+        self.assertEqual(report.rendered, ["index.md", "blog/post.md"])
+        self.assertEqual(self.read(os.path.join(self.public, "blog", "post.html")), "<title>Post</title><div><h1>Post</h1><p>Hello</p></div>")
+        self.assertFalse(os.path.exists(self.manifest))
+
+    def test_full_build_skips_unchanged_outputs(self):
+        build_site(self.content, self.template, self.public)
+        output = os.path.join(self.public, "index.html")
+        os.utime(output, ns=(0, 0))
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Post\n\nChanged")
+        report = build_site(self.content, self.template, self.public)
+        self.assertEqual(report.files_written, 1)
+        self.assertEqual(report.files_unchanged, 1)
+        self.assertEqual(report.bytes_written, len(self.read(os.path.join(self.public, "blog", "post.html")).encode("utf-8")))
+        self.assertEqual(os.stat(output).st_mtime_ns, 0)
+
+    def test_static_assets(self):
+        static = os.path.join(self.root, "static")
+        self.write(os.path.join(static, "styles.css"), "body {}")
+        self.write(self.template, '<link href="/styles.css">{{ Content }}')
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\n[css](/styles.css)")
+        report = build_site(self.content, self.template, self.public, self.manifest, static_dir=static, fingerprint=True)
+        output = load_manifest(self.manifest)["assets"]["styles.css"]["output"]
+        self.assertEqual(report.assets.copied, ["styles.css"])
+        html = self.read(os.path.join(self.public, "index.html"))
+        self.assertEqual(html.count(f'href="/{output}"'), 2)
+
+        report = build_site(self.content, self.template, self.public, self.manifest, static_dir=static, fingerprint=True)
+        self.assertEqual(report.assets.unchanged, 1)
+        self.assertEqual(report.rendered, [])
+
+        self.write(os.path.join(static, "styles.css"), "p {}")
+        report = build_site(self.content, self.template, self.public, self.manifest, static_dir=static, fingerprint=True)
+        self.assertEqual(report.rendered, ["index.md", "blog/post.md"])
+        self.assertEqual(report.assets.removed, [output])
+        self.assertNotIn(output, self.read(os.path.join(self.public, "index.html")))
+
+    def test_block_cache(self):
+        options = RenderOptions(block_cache_dir=os.path.join(self.root, ".build", "blocks"), block_cache_size=1024)
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nOne\n\nTwo")
+        report = build_site(self.content, self.template, self.public, self.manifest, options=options)
+        self.assertEqual((report.block_cache_hits, report.block_cache_misses), (0, 5))
+        self.assertGreater(report.block_cache_bytes, 0)
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nOne\n\nThree")
+        report = build_site(self.content, self.template, self.public, self.manifest, options=options)
+        self.assertEqual((report.block_cache_hits, report.block_cache_misses), (2, 1))
+        self.assertIn("<p>Three</p>", self.read(os.path.join(self.public, "index.html")))
+
+    def test_block_cache_eviction(self):
+        options = RenderOptions(block_cache_dir=os.path.join(self.root, ".build", "blocks"), block_cache_size=20)
+        report = build_site(self.content, self.template, self.public, options=options, workers=2)
+        self.assertEqual(report.block_cache_misses, 4)
+        self.assertGreater(report.block_cache_evicted, 0)
+        self.assertLessEqual(report.block_cache_bytes, 20)
+
+    def test_highlight(self):
+        options = RenderOptions(highlighter="test_highlight:TaggingHighlighter", highlight_cache_dir=os.path.join(self.root, ".build", "highlight"), highlight_cache_size=1024)
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\n```py\nx = 1\n```\n\nSee `x`")
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Post\n\nSee `x`")
+        report = build_site(self.content, self.template, self.public, options=options)
+        self.assertEqual((report.highlight_hits, report.highlight_misses), (1, 2))
+        self.assertGreater(report.highlight_bytes, 0)
+        self.assertIn('<pre><code class="language-py"><span class="py">X = 1\n</span></code></pre>', self.read(os.path.join(self.public, "index.html")))
+        self.assertIn('<code><span class="inline">X</span></code>', self.read(os.path.join(self.public, "blog", "post.html")))
+        report = build_site(self.content, self.template, self.public, options=options, workers=2)
+        self.assertEqual((report.highlight_hits, report.highlight_misses), (3, 0))
+
+    def test_highlighter_change_rerenders(self):
+        self.build()
+        report = build_site(self.content, self.template, self.public, self.manifest, options=RenderOptions(highlighter="plain"))
+        self.assertEqual(report.rendered, ["index.md", "blog/post.md"])
+
+    def test_link_index(self):
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\n[post](/blog/post) [gone](/gone.html) [web](https://boot.dev)")
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Post\n\n[home](../index.html)")
+        report = self.build()
+        self.assertEqual(report.links.dangling, [("index.html", "/gone.html")])
+        self.assertEqual(report.links.most_linked(5), [("blog/post.html", 1), ("index.html", 1)])
+        self.assertEqual(load_manifest(self.manifest)["pages"]["blog/post.md"]["links"], ["../index.html"])
+
+        self.write(os.path.join(self.content, "gone.md"), "# Gone")
+        report = self.build()
+        self.assertEqual(report.rendered, ["gone.md"])
+        self.assertEqual(report.links.dangling, [])
+        self.assertEqual(report.links.internal, 3)
+
+    def test_link_index_parallel(self):
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\n[post](blog/post.html) [gone](/gone)")
+        report = build_site(self.content, self.template, self.public, workers=2)
+        self.assertEqual(report.links.dangling, [("index.html", "/gone")])
+
+    def read_json(self, path):
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+
+    def test_search_index(self):
+        options = RenderOptions(search=True)
+        report = build_site(self.content, self.template, self.public, self.manifest, options=options)
+        search_dir = os.path.join(self.public, "search")
+        index = self.read_json(os.path.join(search_dir, "index.json"))
+        self.assertEqual(index["documents"], [["/index.html", "Home"], ["/blog/post.html", "Post"]])
+        self.assertEqual(report.search_files, 2)
+        terms = self.read_json(os.path.join(search_dir, index["shards"][0][1]))
+        self.assertEqual(terms["welcome"], [0, 1])
+        self.assertEqual(terms["post"], [1, 5])
+
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Post\n\nWelcome back")
+        report = build_site(self.content, self.template, self.public, self.manifest, options=options)
+        self.assertEqual(report.rendered, ["blog/post.md"])
+        terms = self.read_json(os.path.join(search_dir, index["shards"][0][1]))
+        self.assertEqual(terms["welcome"], [0, 1, 1, 1])
+
+    def test_plain_build_removes_search_index(self):
+        build_site(self.content, self.template, self.public, self.manifest, options=RenderOptions(search=True))
+        self.build()
+        self.assertFalse(os.path.exists(os.path.join(self.public, "search")))
+
+    def test_search_index_after_plain_build(self):
+        self.build()
+        report = build_site(self.content, self.template, self.public, self.manifest, options=RenderOptions(search=True), workers=2)
+        self.assertEqual(report.rendered, ["index.md", "blog/post.md"])
+        self.assertEqual(report.search_terms, 4)
+
+    def tree(self, root):
+        files = {}
+        for dir_path, _, file_names in os.walk(root):
+            for file_name in file_names:
+                path = os.path.join(dir_path, file_name)
+                files[os.path.relpath(path, root)] = self.read(path)
+        return files
+
+    def write_pages(self, count):
+        for index in range(count):
+            self.write(os.path.join(self.content, f"section{index % 3}", f"page{index}.md"), f"# Page {index}\n\n[next](/section{(index + 1) % 3}/page{index + 1}.html) words{index}")
+
+    def build_shards(self, count, options):
+        shard_root = os.path.join(self.root, "shards")
+        static = os.path.join(self.root, "static")
+        for index in range(count):
+            public_dir, manifest_path = shard_paths(shard_root, index)
+            report = build_site(self.content, self.template, public_dir, manifest_path, options=options, static_dir=static, shard=(index, count))
+            self.assertIsNone(report.links)
+        return shard_root
+
+    def test_shard_for(self):
+        sources = [f"blog/post{index}.md" for index in range(300)]
+        shards = [shard_for(source, 4) for source in sources]
+        self.assertEqual(shards, [shard_for(source, 4) for source in sources])
+        self.assertEqual(set(shards), {0, 1, 2, 3})
+        self.assertTrue(all(shards.count(index) > 50 for index in range(4)))
+
+    def test_page_sort_key(self):
+        self.assertEqual(sorted(["b/a.md", "z.md", "a/b/c.md", "a/z.md"], key=page_sort_key), ["z.md", "a/z.md", "a/b/c.md", "b/a.md"])
+
+    def test_merge_shards_matches_full_build(self):
+        self.write_pages(12)
+        self.write(os.path.join(self.root, "static", "styles.css"), "body {}")
+        options = RenderOptions(search=True)
+        full = build_site(self.content, self.template, self.public, options=options, static_dir=os.path.join(self.root, "static"))
+        shard_root = self.build_shards(3, options)
+        merged_public = os.path.join(self.root, "merged")
+        merged_manifest = os.path.join(self.root, "merged.json")
+        report = merge_shards(shard_root, 3, merged_public, merged_manifest)
+        self.assertEqual(self.tree(merged_public), self.tree(self.public))
+        self.assertEqual(report.skipped, full.rendered)
+        self.assertEqual(report.links.dangling, full.links.dangling)
+        self.assertEqual(len(load_manifest(merged_manifest)["pages"]), 14)
+
+        os.remove(os.path.join(self.content, "section0", "page0.md"))
+        self.build_shards(3, options)
+        report = merge_shards(shard_root, 3, merged_public, merged_manifest)
+        self.assertEqual(report.removed, ["section0/page0.md"])
+        self.assertFalse(os.path.exists(os.path.join(merged_public, "section0", "page0.html")))
+        self.assertEqual(report.files_unchanged, 14)
+
+        self.build_shards(3, None)
+        merge_shards(shard_root, 3, merged_public, merged_manifest)
+        self.assertFalse(os.path.exists(os.path.join(merged_public, "search")))
+
+    def test_merge_shards_errors(self):
+        shard_root = self.build_shards(2, None)
+        with self.assertRaises(ValueError) as cm:
+            merge_shards(shard_root, 3, self.public)
+        self.assertEqual(cm.exception.args, ("Shard 0 of 3 missing",))
+        public_dir, manifest_path = shard_paths(shard_root, 1)
+        self.write(self.template, "<main>{{ Content }}</main>")
+        build_site(self.content, self.template, public_dir, manifest_path, shard=(1, 2))
+        with self.assertRaises(ValueError) as cm:
+            merge_shards(shard_root, 2, self.public)
+        self.assertEqual(cm.exception.args, ("Shards built with different templates or assets",))
+
+    def test_manifest_format(self):
+        self.build()
+        manifest = load_manifest(self.manifest)
+        self.assertEqual(manifest["version"], MANIFEST_VERSION)
+        self.assertEqual(manifest["pages"]["blog/post.md"]["output"], "blog/post.html")
+        self.assertEqual(len(manifest["pages"]["index.md"]["hash"]), 64)
+
+    def test_incremental_skips_unchanged(self):
+        self.build()
+        report = self.build()
+        self.assertEqual(report.rendered, [])
+        self.assertEqual(report.skipped, ["index.md", "blog/post.md"])
+
+    def test_incremental_renders_changed_page(self):
+        self.build()
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nChanged")
+        report = self.build()
+        self.assertEqual(report.rendered, ["index.md"])
+        self.assertIn("Changed", self.read(os.path.join(self.public, "index.html")))
+
+    def test_incremental_template_change(self):
+        self.build()
+        self.write(self.template, "<h1>{{ Title }}</h1>{{ Content }}")
+        report = self.build()
+        self.assertEqual(report.rendered, ["index.md", "blog/post.md"])
+
+    def test_incremental_removes_deleted_page(self):
+        self.build()
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        report = self.build()
+        self.assertEqual(report.removed, ["blog/post.md"])
+        self.assertFalse(os.path.exists(os.path.join(self.public, "blog")))
+        self.assertNotIn("blog/post.md", load_manifest(self.manifest)["pages"])
+
+    def test_incremental_missing_output(self):
+        self.build()
+        os.remove(os.path.join(self.public, "index.html"))
+        report = self.build()
+        self.assertEqual(report.rendered, ["index.md"])
+
+    def test_incremental_corrupt_manifest(self):
+        self.build()
+        self.write(self.manifest, '{"version": 1, "pages": ')
+        report = self.build()
+        self.assertEqual(report.rendered, ["index.md", "blog/post.md"])
+        with open(self.manifest, encoding="utf-8") as file:
+            self.assertEqual(json.load(file)["version"], MANIFEST_VERSION)
+
+    def test_parallel_build_matches_serial(self):
+        for index in range(12):
+            self.write(os.path.join(self.content, "notes", f"note{index}.md"), f"# Note {index}\n\nSome **text** {index}")
+        build_site(self.content, self.template, self.public)
+        serial = {path: self.read(os.path.join(self.public, path)) for path in ("index.html", "notes/note7.html")}
+        parallel_public = os.path.join(self.root, "parallel")
+        report = build_site(self.content, self.template, parallel_public, workers=2, chunksize=3)
+        self.assertEqual(len(report.rendered), 14)
+        for path, html in serial.items():
+            self.assertEqual(self.read(os.path.join(parallel_public, path)), html)
+
+    def test_render_pages_keeps_order(self):
+        pages = [(f"page{index}.md", f"# Page {index}") for index in range(10)]
+        self.assertEqual([result.html for result in render_pages(pages, "{{ Title }}", workers=2)], [f"Page {index}" for index in range(10)])
+
+    def test_inline_cache_stats(self):
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\n- **same**\n- **same**\n- **same**")
+        report = build_site(self.content, self.template, self.public, options=RenderOptions(inline_cache_size=16))
+        self.assertEqual(report.inline_cache_hits, 2)
+        self.assertEqual(report.inline_cache_misses, 4)
+        self.assertIn("<li><b>same</b></li><li><b>same</b></li>", self.read(os.path.join(self.public, "index.html")))
+
+    def test_inline_cache_stats_parallel(self):
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\n- **same**\n- **same**\n- **same**")
+        report = build_site(self.content, self.template, self.public, workers=2, chunksize=1, options=RenderOptions(inline_cache_size=16))
+        self.assertEqual(report.inline_cache_hits + report.inline_cache_misses, 6)
+
+    def test_profile(self):
+        report = build_site(self.content, self.template, self.public, options=RenderOptions(profile=True))
+        self.assertEqual(sorted(profile.page for profile in report.profile.pages), ["blog/post.md", "index.md"])
+        totals = report.profile.stage_totals()
+        self.assertEqual(totals["markdown_to_blocks"][0], 2)
+        self.assertEqual(totals["block_to_block_type"][2], 4)
+        self.assertIn("to_html", totals)
+        self.assertIsNone(build_site(self.content, self.template, self.public).profile)
+
+    def test_profile_parallel_trace(self):
+        report = build_site(self.content, self.template, self.public, workers=2, chunksize=1, options=RenderOptions(trace=True))
+        events = report.profile.chrome_trace()["traceEvents"]
+        self.assertEqual(sorted(event["name"] for event in events if event["cat"] == "page"), ["blog/post.md", "index.md"])
+        self.assertTrue(any(event["name"] == "text_to_tokens" for event in events))
+
+    def test_default_chunksize(self):
+        self.assertEqual(default_chunksize(0, 4), 1)
+        self.assertEqual(default_chunksize(1000, 4), 62)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+from cache import LRUCache, format_bytes, format_hit_rate
+
+class TestLRUCache(unittest.TestCase):
+    def test_get_and_put(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("b"), None)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError) as cm:
+            LRUCache(0)
+        exception_value = cm.exception
+        self.assertEqual(exception_value.args, ("Cache size must be positive",))
+
+    def test_clear(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.get("a")
+        cache.clear()
+        self.assertEqual(repr(cache), "LRUCache(0/2 entries, 0 hits, 0 misses)")
+
+    def test_format_hit_rate(self):
+        self.assertEqual(format_hit_rate("Inline cache", 3, 1), "Inline cache: 3 hits, 1 misses (75.0% hit rate)")
+        self.assertEqual(format_hit_rate("Inline cache", 0, 0), "Inline cache: 0 hits, 0 misses (0.0% hit rate)")
+
+    def test_format_bytes(self):
+        self.assertEqual(format_bytes(512), "512 B")
+        self.assertEqual(format_bytes(1536), "1.5 KiB")
+        self.assertEqual(format_bytes(3 * 1024 * 1024), "3.0 MiB")
+        self.assertEqual(format_bytes(2 * 1024 ** 3), "2.0 GiB")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import mock
+
+from convert import main
+
+class TestConvert(unittest.TestCase):
+    def convert(self, markdown, argv):
+        stdout = io.StringIO()
+        with mock.patch("sys.stdin", io.StringIO(markdown)), redirect_stdout(stdout):
+            status = main(argv)
+        return status, stdout.getvalue()
+
+    def test_convert_stdin(self):
+        self.assertEqual(self.convert("# Title\n\nSome **bold**\n", []), (0, "<div><h1>Title</h1><p>Some <b>bold</b></p></div>\n"))
+
+    def test_convert_with_template(self):
+        with tempfile.TemporaryDirectory() as directory:
+            template_path = os.path.join(directory, "template.html")
+            with open(template_path, "w", encoding="utf-8") as file:
+                file.write("<title>{{ Title }}</title>{{ Content }}")
+            self.assertEqual(self.convert("# Title\n\nBody", ["--template", template_path]), (0, "<title>Title</title><div><h1>Title</h1><p>Body</p></div>"))
+
+    def test_usage(self):
+        with redirect_stderr(io.StringIO()) as stderr:
+            self.assertEqual(main(["--template"]), 2)
+        self.assertIn("usage", stderr.getvalue())
+
+    def test_import_is_lazy(self):
+        code = "import sys, convert; print(sorted(name for name in ('page', 'parser', 'block', 'htmlnode') if name in sys.modules))"
+        result = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "[]")
+
+    def test_conversion_skips_build_modules(self):
+        code = ("import io, sys, convert; sys.stdin = io.StringIO('# Title\\n\\n- [a](/b) `c`\\n\\n```py\\nx\\n```'); convert.main([]); "
+                "print(sorted(name for name in ('concurrent.futures', 'hashlib', 'json', 'cache', 'diskcache', 'writer') if name in sys.modules), file=sys.stderr)")
+        result = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True)
+        self.assertIn("<h1>Title</h1>", result.stdout)
+        self.assertEqual(result.stderr.strip(), "['cache']")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+
+from diskcache import DiskCache
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.temp_dir.name, "blocks")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_get_and_put(self):
+        cache = DiskCache(self.directory, 1024)
+        key = cache.key("# Title")
+        self.assertEqual(cache.get(key), None)
+        cache.put(key, "<h1>Title</h1>")
+        self.assertEqual(DiskCache(self.directory, 1024).get(key), "<h1>Title</h1>")
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        self.assertEqual(cache.disk_usage(), 14)
+
+    def test_salt(self):
+        self.assertEqual(DiskCache(self.directory, 1).key("a"), DiskCache(self.directory, 1).key("a"))
+        self.assertNotEqual(DiskCache(self.directory, 1).key("a"), DiskCache(self.directory, 1, "v2").key("a"))
+
+    def test_evicts_least_recently_used(self):
+        cache = DiskCache(self.directory, 20)
+        keys = [cache.key(text) for text in "abc"]
+        for index, key in enumerate(keys):
+            cache.put(key, "x" * 10)
+            os.utime(cache._path(key), ns=(index, index))
+        cache.get(keys[0])
+        self.assertEqual(cache.evict(), 1)
+        self.assertEqual(cache.get(keys[1]), None)
+        self.assertEqual(cache.get(keys[2]), "x" * 10)
+        self.assertEqual(cache.disk_usage(), 20)
+
+    def test_missing_directory(self):
+        cache = DiskCache(self.directory, 1)
+        self.assertEqual(cache.disk_usage(), 0)
+        self.assertEqual(cache.evict(), 0)
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            DiskCache(self.directory, 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import tempfile
+import unittest
+
+from diskcache import DiskCache
+from highlight import CachedHighlighter, Highlighter, PygmentsHighlighter, highlight_cache_salt, load_highlighter
+
+class TaggingHighlighter(Highlighter):
+    name = "tagging"
+    version = "2"
+
+    def highlight(self, code, language):
+        return f"<span class=\"{language or 'inline'}\">{code.upper()}</span>"
+
+class TestHighlight(unittest.TestCase):
+    def test_plain(self):
+        self.assertEqual(Highlighter().highlight("a < b & c", "python"), "a &lt; b &amp; c")
+
+    def test_load_highlighter(self):
+        self.assertIsInstance(load_highlighter("plain"), Highlighter)
+        self.assertIs(load_highlighter("test_highlight:TaggingHighlighter"), load_highlighter("test_highlight:TaggingHighlighter"))
+        self.assertEqual(repr(load_highlighter("test_highlight:TaggingHighlighter")), "TaggingHighlighter(tagging 2)")
+
+    def test_load_highlighter_errors(self):
+        for spec, message in (("nope", "Unknown highlighter: nope"), ("test_highlight:Missing", "Unknown highlighter: test_highlight:Missing"),
+                              ("no_such_module:Highlighter", "Unknown highlighter: no_such_module:Highlighter"), ("test_highlight:TestHighlight", "Not a highlighter: test_highlight:TestHighlight")):
+            with self.assertRaises(ValueError) as cm:
+                load_highlighter(spec)
+            self.assertEqual(str(cm.exception), message)
+
+    def test_pygments(self):
+        try:
+            highlighter = PygmentsHighlighter()
+        except ValueError:
+            self.skipTest("Pygments is not installed")
+        self.assertIn('<span class="k">def</span>', highlighter.highlight("def f(): pass", "python"))
+        self.assertEqual(highlighter.highlight("a < b", "no-such-language"), "a &lt; b")
+        self.assertEqual(highlighter.highlight("x = 1", ""), "x = 1")
+        self.assertTrue(highlighter.highlight("x = 1\n", "python").endswith("</span>\n"))
+
+    def test_cached_highlighter(self):
+        with tempfile.TemporaryDirectory() as directory:
+            highlighter = TaggingHighlighter()
+            cached = CachedHighlighter(highlighter, DiskCache(directory, 1024, highlight_cache_salt(highlighter)))
+            self.assertEqual(cached("x = 1", "python"), '<span class="python">X = 1</span>')
+            self.assertEqual(cached("x = 1", ""), '<span class="inline">X = 1</span>')
+            again = CachedHighlighter(highlighter, DiskCache(directory, 1024, highlight_cache_salt(highlighter)))
+            self.assertEqual(again("x = 1", "python"), '<span class="python">X = 1</span>')
+            self.assertEqual((cached.hits, cached.misses, again.hits, again.misses), (0, 2, 1, 0))
+            highlighter.version = "3"
+            newer = CachedHighlighter(highlighter, DiskCache(directory, 1024, highlight_cache_salt(highlighter)))
+            newer("x = 1", "python")
+            self.assertEqual((newer.hits, newer.misses), (0, 1))
+            self.assertGreater(newer.seconds, 0)
+
+    def test_without_cache(self):
+        cached = CachedHighlighter(TaggingHighlighter())
+        cached("a", "")
+        cached("a", "")
+        self.assertEqual((cached.hits, cached.misses), (0, 2))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,9 @@
+import io
 import unittest
 
-from htmlnode import HTMLNode, LeafNode, ParentNode, text_node_to_html_node
+import htmlnode
+from htmlnode import CodeBlockNode, FrozenNode, HTMLNode, InlineNode, LeafNode, ParentNode, count_nodes, freeze, get_fragment_cache, text_node_to_html_node, tokens_to_html_nodes, write_tokens_html
+from parser import text_to_textnodes, text_to_tokens
 from textnode import TextNode, TextType
 
 class TestHTMLNode(unittest.TestCase):
@@ -37,6 +40,36 @@ class TestHTMLNode(unittest.TestCase):
         self.assertEqual(node.props_to_html(), " href=\"https://www.google.com\" target=\"_blank\"")
 
 
+    def test_props_to_html_escapes(self):
+        node = HTMLNode()
+        node.props = {"href": "/search?q=a&b=\"c\"", "alt": "<tag> 'quoted'"}
+        self.assertEqual(
+            node.props_to_html(),
+            " href=\"/search?q=a&amp;b=&quot;c&quot;\" alt=\"&lt;tag&gt; &#x27;quoted&#x27;\"",
+        )
+
+    def test_props_to_html_order(self):
+        self.assertEqual(LeafNode("a", "x", {"class": "nav", "href": "/index.html"}).props_to_html(), " class=\"nav\" href=\"/index.html\"")
+
+    def test_props_to_html_unhashable(self):
+        node = HTMLNode()
+        node.props = {"class": ["a", "b"]}
+        self.assertEqual(node.props_to_html(), " class=\"[&#x27;a&#x27;, &#x27;b&#x27;]\"")
+
+    def test_props_to_html_memo_is_bounded(self):
+        size = htmlnode.ATTRIBUTE_CACHE_SIZE
+        for index in range(size + 10):
+            self.assertEqual(LeafNode("a", "x", {"href": f"/p{index}?a&b"}).props_to_html(), f" href=\"/p{index}?a&amp;b\"")
+        self.assertLessEqual(len(htmlnode._rendered_props), size)
+        self.assertLessEqual(len(htmlnode._escaped_attributes), size)
+        self.assertEqual(LeafNode("a", "x", {"href": "/p0?a&b"}).props_to_html(), " href=\"/p0?a&amp;b\"")
+        self.assertEqual(htmlnode.escape_attribute(f"/p{size + 9}?a&b"), f"/p{size + 9}?a&amp;b")
+
+    def test_to_html_not_implemented(self):
+        with self.assertRaises(NotImplementedError):
+            HTMLNode().to_html()
+
+
 class TestLeafNode(unittest.TestCase):
     def test_init_without_props(self):
         node = LeafNode("p", "test")
@@ -52,6 +85,10 @@ class TestLeafNode(unittest.TestCase):
         self.assertEqual(node.children, None)
         self.assertEqual(node.props, {"href": "https://www.google.com"})
 
+    def test_slots(self):
+        self.assertFalse(hasattr(LeafNode("p", "test"), "__dict__"))
+        self.assertFalse(hasattr(ParentNode("div", []), "__dict__"))
+
     def test_to_html_without_value(self):
         with self.assertRaises(ValueError) as cm:
             LeafNode("p", None).to_html()
@@ -100,6 +137,45 @@ class TestParentNode(unittest.TestCase):
         exception_value = cm.exception
         self.assertEqual(exception_value.args, ("Children missing",))
 
+    def test_iter_html(self):
+        parent_node = ParentNode("div", [LeafNode("b", "bold"), LeafNode(None, " text")], {"class": "note"})
+        self.assertEqual(
+            list(parent_node.iter_html()),
+            ["<div class=\"note\">", "<b>bold</b>", " text", "</div>"],
+        )
+
+    def test_write_html(self):
+        grandchild_node = LeafNode("b", "grandchild")
+        child_node = ParentNode("span", [grandchild_node])
+        parent_node = ParentNode("div", [child_node])
+        sink = io.StringIO()
+        parent_node.write_html(sink)
+        self.assertEqual(sink.getvalue(), parent_node.to_html())
+
+    def test_write_html_without_tag(self):
+        with self.assertRaises(ValueError) as cm:
+            ParentNode(None, [LeafNode("span", "child")]).write_html(io.StringIO())
+        exception_value = cm.exception
+        self.assertEqual(exception_value.args, ("Tag missing",))
+
+    def test_to_html_deep_nesting(self):
+        depth = 100000
+        node = LeafNode("b", "deep")
+        for _ in range(depth):
+            node = ParentNode("div", [node])
+        self.assertEqual(node.to_html(), "<div>" * depth + "<b>deep</b>" + "</div>" * depth)
+        self.assertEqual(sum(len(chunk) for chunk in node.iter_html()), depth * 11 + 11)
+
+    def test_to_html_nested_siblings(self):
+        parent_node = ParentNode("ul", [
+            ParentNode("li", [LeafNode(None, "one"), ParentNode("ul", [ParentNode("li", [LeafNode(None, "two")])])]),
+            ParentNode("li", [LeafNode("b", "three")]),
+            LeafNode(None, "tail"),
+        ])
+        expected = "<ul><li>one<ul><li>two</li></ul></li><li><b>three</b></li>tail</ul>"
+        self.assertEqual(parent_node.to_html(), expected)
+        self.assertEqual("".join(parent_node.iter_html()), expected)
+
     def test_repr_with_children(self):
         child_node = LeafNode("span", "child")
         parent_node = ParentNode("div", [child_node])
@@ -114,6 +190,11 @@ class TestParentNode(unittest.TestCase):
             "ParentNode(div, [ParentNode(span, [LeafNode(b, grandchild, None)], None)], None)",
         )
 
+    def test_count_nodes(self):
+        parent_node = ParentNode("div", [ParentNode("span", [LeafNode("b", "x"), LeafNode(None, "y")]), LeafNode("i", "z")])
+        self.assertEqual(count_nodes(parent_node), 5)
+        self.assertEqual(count_nodes(LeafNode("p", "x")), 1)
+
 class TestTextNodeToHTMLNode(unittest.TestCase):
     def test_text(self):
         node = TextNode("This is a text node", TextType.TEXT)
@@ -153,5 +234,118 @@ class TestTextNodeToHTMLNode(unittest.TestCase):
         self.assertEqual(html_node.value, "")
         self.assertEqual(html_node.props, {"src": "https://imgs.search.brave.com/YVV4ux7tv7fuEqP_WeVmXRe0ch7p9N83lTICdLpcUA0/rs:fit:860:0:0:0/g:ce/aHR0cHM6Ly9wcmV2/aWV3LnJlZGQuaXQv/c29tZS1vZi1teS1h/bGwtdGltZS1mYXZv/cml0ZS1hdmF0YXIt/ZmFuYXJ0LWJ5LXYw/LXFiMHc3OHJ0dWxr/ZTEuanBnP3dpZHRo/PTY0MCZjcm9wPXNt/YXJ0JmF1dG89d2Vi/cCZzPTM1OTVhYmY0/MTU4NTNkZTlmYWIx/MDYzOTg3MWJlNzg3/N2RiYjQwZTE", "alt": "This is a image node"})
 
+class TestFrozenNode(unittest.TestCase):
+    def setUp(self):
+        get_fragment_cache().clear()
+
+    def tearDown(self):
+        get_fragment_cache().clear()
+
+    def make_nav(self, sections):
+        self.builds += 1
+        return ParentNode("ul", [ParentNode("li", [LeafNode("a", section, {"href": f"/{section}/"})]) for section in sections])
+
+    def test_renders_once_per_key(self):
+        self.builds = 0
+        pages = [ParentNode("body", [FrozenNode(("nav", "a,b"), lambda: self.make_nav(["a", "b"])), LeafNode("p", str(index))]) for index in range(3)]
+        html = [page.to_html() for page in pages]
+        self.assertEqual(html[2], '<body><ul><li><a href="/a/">a</a></li><li><a href="/b/">b</a></li></ul><p>2</p></body>')
+        self.assertEqual("".join(pages[1].iter_html()), html[1])
+        self.assertEqual(self.builds, 1)
+        self.assertEqual((get_fragment_cache().hits, get_fragment_cache().misses), (3, 1))
+
+    def test_new_key_rerenders(self):
+        self.builds = 0
+        self.assertIn("/a/", FrozenNode(("nav", "a"), lambda: self.make_nav(["a"])).to_html())
+        self.assertIn("/c/", FrozenNode(("nav", "c"), lambda: self.make_nav(["c"])).to_html())
+        self.assertEqual(self.builds, 2)
+
+    def test_freeze(self):
+        node = freeze(LeafNode("footer", "bye"), "footer")
+        self.assertEqual(ParentNode("div", [node, node]).to_html(), "<div><footer>bye</footer><footer>bye</footer></div>")
+        self.assertEqual(repr(node), "FrozenNode(footer)")
+        self.assertEqual(count_nodes(ParentNode("div", [node])), 2)
+
+    def test_asset_urls_clear_cache(self):
+        freeze(LeafNode("p", "x"), "p").to_html()
+        htmlnode.set_asset_urls({"/a.css": "/a.1.css"})
+        try:
+            self.assertEqual(len(get_fragment_cache()), 0)
+        finally:
+            htmlnode.set_asset_urls(None)
+
+class TestInlineTokensToHTML(unittest.TestCase):
+    text = "This is **text** with an _italic_ word and a `code block` and an ![obi wan image](https://i.imgur.com/fJRm4Vk.jpeg) and a [link](https://boot.dev)"
+
+    def expected_html(self):
+        return "".join(text_node_to_html_node(text_node).to_html() for text_node in text_to_textnodes(self.text))
+
+    def test_tokens_to_html_nodes(self):
+        html_nodes = tokens_to_html_nodes(text_to_tokens(self.text))
+        expected = [text_node_to_html_node(text_node) for text_node in text_to_textnodes(self.text)]
+        self.assertEqual([repr(node) for node in html_nodes], [repr(node) for node in expected])
+
+    def test_write_tokens_html(self):
+        chunks = []
+        write_tokens_html(text_to_tokens(self.text), chunks.append)
+        self.assertEqual("".join(chunks), self.expected_html())
+
+    def test_write_tokens_html_escapes_attributes(self):
+        chunks = []
+        write_tokens_html(text_to_tokens('[q](/s?a=1&b="2") ![a "b"](/i.png)'), chunks.append)
+        self.assertEqual("".join(chunks), '<a href="/s?a=1&amp;b=&quot;2&quot;">q</a> <img src="/i.png" alt="a &quot;b&quot;"></img>')
+
+    def test_inline_node(self):
+        node = InlineNode(text_to_tokens(self.text))
+        self.assertEqual(node.to_html(), self.expected_html())
+        self.assertEqual("".join(node.iter_html()), self.expected_html())
+        self.assertEqual(ParentNode("p", [node]).to_html(), f"<p>{self.expected_html()}</p>")
+        self.assertEqual(repr(InlineNode(text_to_tokens("a"))), "InlineNode(InlineTokens(1 tokens, 1 chars))")
+
+    def test_code_block_node(self):
+        source = "```\nif a < b && c > d:\n```"
+        node = CodeBlockNode(source, 4, len(source) - 3)
+        self.assertEqual(node.to_html(), "<pre><code>if a &lt; b &amp;&amp; c &gt; d:\n</code></pre>")
+        self.assertEqual("".join(node.iter_html()), node.to_html())
+        self.assertEqual(repr(node), "CodeBlockNode(19 chars)")
+        node = CodeBlockNode("```py\nx\n```", 6, 8, "py")
+        self.assertEqual(node.to_html(), '<pre><code class="language-py">x\n</code></pre>')
+        self.assertEqual("".join(node.iter_html()), node.to_html())
+
+    def test_code_block_node_chunks(self):
+        source = "x < y\n" * (htmlnode.ESCAPE_CHUNK_SIZE // 3)
+        chunks = list(CodeBlockNode(source).iter_html())
+        self.assertGreater(len(chunks), 3)
+        self.assertEqual("".join(chunks), f"<pre><code>{source.replace('<', '&lt;')}</code></pre>")
+
+    def test_code_highlighter(self):
+        source = "```js\nlet a = b < c\n```"
+        htmlnode.set_code_highlighter(lambda code, language: f"[{language}:{code.strip()}]")
+        try:
+            block = CodeBlockNode(source, 6, len(source) - 3, "js").to_html()
+            chunks = []
+            write_tokens_html(text_to_tokens("use `x < y` here"), chunks.append)
+            nodes = "".join(node.to_html() for node in tokens_to_html_nodes(text_to_tokens("`x`")))
+            leaf = text_node_to_html_node(TextNode("x", TextType.CODE)).to_html()
+        finally:
+            htmlnode.set_code_highlighter(None)
+        self.assertEqual(block, '<pre><code class="language-js">[js:let a = b < c]</code></pre>')
+        self.assertEqual("".join(chunks), "use <code>[:x < y]</code> here")
+        self.assertEqual((nodes, leaf), ("<code>[:x]</code>", "<code>[:x]</code>"))
+
+    def test_asset_urls(self):
+        text = "[css](/styles.css) ![logo](/logo.png) [home](/)"
+        htmlnode.set_asset_urls({"/styles.css": "/styles.abc.css", "/logo.png": "/logo.def.png"})
+        try:
+            chunks = []
+            write_tokens_html(text_to_tokens(text), chunks.append)
+            expected = "".join(text_node_to_html_node(text_node).to_html() for text_node in text_to_textnodes(text))
+            nodes = "".join(node.to_html() for node in tokens_to_html_nodes(text_to_tokens(text)))
+        finally:
+            htmlnode.set_asset_urls(None)
+        self.assertEqual(expected, '<a href="/styles.abc.css">css</a> <img src="/logo.def.png" alt="logo"></img> <a href="/">home</a>')
+        self.assertEqual("".join(chunks), expected)
+        self.assertEqual(nodes, expected)
+
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+from links import LinkIndex, find_target, resolve_link
+
+class TestResolveLink(unittest.TestCase):
+    def test_external(self):
+        for url in ("https://boot.dev", "mailto:me@example.com", "//cdn.example.com/a.js", "#top", ""):
+            self.assertEqual(resolve_link("index.html", url), None)
+
+    def test_root_relative(self):
+        self.assertEqual(resolve_link("blog/post.html", "/about.html"), "about.html")
+        self.assertEqual(resolve_link("blog/post.html", "/"), "index.html")
+        self.assertEqual(resolve_link("blog/post.html", "/docs/"), "docs/index.html")
+        self.assertEqual(resolve_link("blog/post.html", "/about.html?a=1#team"), "about.html")
+
+    def test_relative(self):
+        self.assertEqual(resolve_link("blog/post.html", "other.html"), "blog/other.html")
+        self.assertEqual(resolve_link("blog/post.html", "../images/a.png"), "images/a.png")
+        self.assertEqual(resolve_link("blog/post.html", "./"), "blog/index.html")
+
+    def test_find_target(self):
+        targets = {"about.html", "docs/index.html"}
+        self.assertEqual(find_target("about.html", targets), "about.html")
+        self.assertEqual(find_target("about", targets), "about.html")
+        self.assertEqual(find_target("docs", targets), "docs/index.html")
+        self.assertEqual(find_target("missing", targets), None)
+
+class TestLinkIndex(unittest.TestCase):
+    def test_index(self):
+        index = LinkIndex({"index.html", "blog/post.html", "styles.css"})
+        index.add_page("index.html", ["/blog/post", "https://boot.dev", "/missing.html", "#top"])
+        index.add_page("blog/post.html", ["/", "/styles.css", "/index.html", "post.html"])
+        self.assertEqual((index.internal, index.external), (6, 2))
+        self.assertEqual(index.dangling, [("index.html", "/missing.html")])
+        self.assertEqual(index.backlinks, {"blog/post.html": {"index.html"}, "index.html": {"blog/post.html"}, "styles.css": {"blog/post.html"}})
+        self.assertEqual(index.most_linked(2), [("blog/post.html", 1), ("index.html", 1)])
+        self.assertEqual(repr(index), "LinkIndex(6 internal, 2 external, 1 dangling)")
+
+    def test_format_report(self):
+        index = LinkIndex({"index.html"})
+        index.add_page("a.html", ["/", "/gone"])
+        self.assertEqual(index.format_report(), "Dangling links: 1\n  a.html -> /gone\nMost linked 1 of 1 targets:\n       1 pages  index.html")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+import io
+import tempfile
+import unittest
+
+from cache import LRUCache
+from diskcache import DiskCache
+from page import PageCollector, extract_title, generate_page, markdown_to_html_node, set_block_cache, set_inline_cache, set_collector, text_to_children, write_markdown_html
+from search import page_terms
+
+class TestPage(unittest.TestCase):
+    def test_paragraphs(self):
+        md = """
+This is **bolded** paragraph
+text in a p
+tag here
+
+This is another paragraph with _italic_ text and `code` here
+
+"""
+        node = markdown_to_html_node(md)
+        self.assertEqual(
+            node.to_html(),
+            "<div><p>This is <b>bolded</b> paragraph text in a p tag here</p><p>This is another paragraph with <i>italic</i> text and <code>code</code> here</p></div>",
+        )
+
+    def test_quote(self):
+        node = markdown_to_html_node("> a **quoted**\n> line")
+        self.assertEqual(node.to_html(), "<div><blockquote>a <b>quoted</b> line</blockquote></div>")
+
+    def test_unordered_list(self):
+        node = markdown_to_html_node("- first [link](https://boot.dev)\n- second")
+        self.assertEqual(
+            node.to_html(),
+            "<div><ul><li>first <a href=\"https://boot.dev\">link</a></li><li>second</li></ul></div>",
+        )
+
+    def test_headings(self):
+        node = markdown_to_html_node("# Title\n\n### Sub **bold**")
+        self.assertEqual(node.to_html(), "<div><h1>Title</h1><h3>Sub <b>bold</b></h3></div>")
+
+    def test_code_block(self):
+        node = markdown_to_html_node("```\nThis is text that _should_ remain\nthe **same** even with inline stuff\n```")
+        self.assertEqual(
+            node.to_html(),
+            "<div><pre><code>This is text that _should_ remain\nthe **same** even with inline stuff\n</code></pre></div>",
+        )
+
+    def test_ordered_list(self):
+        node = markdown_to_html_node("1. first\n2. _second_")
+        self.assertEqual(node.to_html(), "<div><ol><li>first</li><li><i>second</i></li></ol></div>")
+
+    def test_code_block_escaped(self):
+        node = markdown_to_html_node("```\n<div class=\"a\">&amp;</div>\n```")
+        self.assertEqual(node.to_html(), "<div><pre><code>&lt;div class=\"a\"&gt;&amp;amp;&lt;/div&gt;\n</code></pre></div>")
+
+    def test_long_list(self):
+        md = "\n".join(f"- item **{index}** [link](/{index})" for index in range(1000))
+        node = markdown_to_html_node(md)
+        expected = "".join(f'<li>item <b>{index}</b> <a href="/{index}">link</a></li>' for index in range(1000))
+        self.assertEqual(node.to_html(), f"<div><ul>{expected}</ul></div>")
+        self.assertEqual("".join(node.iter_html()), node.to_html())
+        set_inline_cache(LRUCache(16))
+        try:
+            self.assertEqual(markdown_to_html_node(md).to_html(), node.to_html())
+        finally:
+            set_inline_cache(None)
+
+    def test_write_markdown_html(self):
+        md = "# Title\n\nSome **text**\n\n```\na\n\nb\n```\n"
+        sink = io.StringIO()
+        write_markdown_html(io.StringIO(md), sink)
+        self.assertEqual(sink.getvalue(), markdown_to_html_node(md).to_html())
+
+    def test_extract_title(self):
+        self.assertEqual(extract_title("Intro\n\n#  Hello world  \n\n## Sub"), "Hello world")
+
+    def test_extract_title_missing(self):
+        with self.assertRaises(ValueError) as cm:
+            extract_title("## Not a title")
+        exception_value = cm.exception
+        self.assertEqual(exception_value.args, ("Title missing",))
+
+    def test_generate_page(self):
+        html = generate_page("# Title\n\nBody", "<title>{{ Title }}</title><main>{{ Content }}</main>")
+        self.assertEqual(html, "<title>Title</title><main><div><h1>Title</h1><p>Body</p></div></main>")
+
+    def test_inline_cache(self):
+        cache = LRUCache(4)
+        set_inline_cache(cache)
+        try:
+            first = text_to_children("a **b** [c](https://boot.dev)")
+            second = text_to_children("a **b** [c](https://boot.dev)")
+        finally:
+            set_inline_cache(None)
+        self.assertEqual(first[0].to_html(), "a <b>b</b> <a href=\"https://boot.dev\">c</a>")
+        self.assertEqual(second[0].to_html(), first[0].to_html())
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_inline_cache_same_output(self):
+        md = "# Title\n\n- _repeated_ item\n- _repeated_ item\n\nA [link](https://boot.dev)"
+        uncached = markdown_to_html_node(md).to_html()
+        set_inline_cache(LRUCache(1))
+        try:
+            cached = markdown_to_html_node(md).to_html()
+        finally:
+            set_inline_cache(None)
+        self.assertEqual(cached, uncached)
+
+    def test_block_cache(self):
+        md = "# Title\n\nFirst _paragraph_\n\n```\ncode\n```"
+        uncached = markdown_to_html_node(md).to_html()
+        with tempfile.TemporaryDirectory() as directory:
+            cache = DiskCache(directory, 1024)
+            set_block_cache(cache)
+            try:
+                first = markdown_to_html_node(md).to_html()
+                second = markdown_to_html_node(md.replace("First", "Second")).to_html()
+                sink = io.StringIO()
+                write_markdown_html(io.StringIO(md), sink)
+            finally:
+                set_block_cache(None)
+        self.assertEqual(first, uncached)
+        self.assertEqual(second, uncached.replace("First", "Second"))
+        self.assertEqual(sink.getvalue(), uncached)
+        self.assertEqual((cache.hits, cache.misses), (5, 4))
+
+    def collect(self, md):
+        collector = PageCollector(search=True)
+        set_collector(collector)
+        try:
+            markdown_to_html_node(md).to_html()
+        finally:
+            set_collector(None)
+        return collector.links, collector.texts, collector.headings
+
+    def test_collector(self):
+        md = "# [Home](/) page\n\n- [a](/a) and ![b](/b.png)\n- **bold** `code`\n\n```\n[not](/a/link)\n```"
+        expected = (["/", "/a", "/b.png"], ["a", " and ", "bold", " "], ["Home", " page"])
+        self.assertEqual(self.collect(md), expected)
+        set_inline_cache(LRUCache(4))
+        try:
+            self.assertEqual(self.collect(md), expected)
+        finally:
+            set_inline_cache(None)
+        with tempfile.TemporaryDirectory() as directory:
+            set_block_cache(DiskCache(directory, 4096))
+            try:
+                self.assertEqual(self.collect(md), expected)
+                self.assertEqual(self.collect(md), expected)
+            finally:
+                set_block_cache(None)
+
+    def test_collector_document_order(self):
+        md = "- [d](/e)\n\n# H [l](/x)"
+        self.assertEqual(self.collect(md)[0], ["/e", "/x"])
+        with tempfile.TemporaryDirectory() as directory:
+            set_block_cache(DiskCache(directory, 4096))
+            try:
+                self.assertEqual(self.collect(md)[0], ["/e", "/x"])
+                self.assertEqual(self.collect(md)[0], ["/e", "/x"])
+            finally:
+                set_block_cache(None)
+
+    def test_collector_heading_link(self):
+        links, texts, headings = self.collect("# See [docs](https://example.com/secret_path)\n\nBody")
+        self.assertEqual((links, texts, headings), (["https://example.com/secret_path"], ["Body"], ["See ", "docs"]))
+        self.assertEqual(page_terms(texts, headings), {"body": 1, "see": 5, "docs": 5})
+
+    def test_collector_without_search(self):
+        collector = PageCollector()
+        set_collector(collector)
+        try:
+            markdown_to_html_node("# Title\n\n[a](/a)")
+        finally:
+            set_collector(None)
+        self.assertEqual((collector.links, collector.texts, collector.headings), (["/a"], None, None))
+
+if __name__ == "__main__":
+    unittest.main()
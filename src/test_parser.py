@@ -1,7 +1,7 @@
 import unittest
 
 from textnode import TextNode, TextType
-from parser import split_nodes_delimiter, extract_markdown_images, extract_markdown_link, split_nodes_image, split_nodes_link, text_to_textnodes
+from parser import split_nodes_delimiter, extract_markdown_images, extract_markdown_link, split_nodes_image, split_nodes_link, text_to_textnodes, text_to_tokens
 
 class TestParser(unittest.TestCase):
     def test_parse_text_bold(self):
@@ -96,6 +96,10 @@ class TestParser(unittest.TestCase):
         )
         self.assertListEqual([("link", "https://www.youtube.com")], matches)
 
+    def test_extract_markdown_link_includes_images(self):
+        matches = extract_markdown_link("A [link](/a) and ![image](/b.png)")
+        self.assertListEqual([("link", "/a"), ("image", "/b.png")], matches)
+
     def test_extract_markdown_images_multi(self):
         matches = extract_markdown_images(
             "This is text with a ![rick roll](https://i.imgur.com/aKaOqIh.gif) and ![obi wan](https://i.imgur.com/fJRm4Vk.jpeg)"
@@ -127,6 +131,17 @@ class TestParser(unittest.TestCase):
             new_nodes,
         )
 
+    def test_split_links_no_empty_fragments(self):
+        node = TextNode("[first](https://a.dev)[second](https://b.dev)", TextType.TEXT)
+        new_nodes = split_nodes_link([node])
+        self.assertListEqual(
+            [
+                TextNode("first", TextType.LINK, "https://a.dev"),
+                TextNode("second", TextType.LINK, "https://b.dev"),
+            ],
+            new_nodes,
+        )
+
     def test_split_links_not_text(self):
         node = TextNode(
             "This is text with a link [to boot dev](https://www.boot.dev) and [to youtube](https://www.youtube.com/@bootdotdev)",
@@ -177,6 +192,17 @@ class TestParser(unittest.TestCase):
             new_nodes,
         )
 
+    def test_split_images_no_empty_fragments(self):
+        node = TextNode("![image](https://i.imgur.com/zjjcJKZ.png) trailing", TextType.TEXT)
+        new_nodes = split_nodes_image([node])
+        self.assertListEqual(
+            [
+                TextNode("image", TextType.IMAGE, "https://i.imgur.com/zjjcJKZ.png"),
+                TextNode(" trailing", TextType.TEXT),
+            ],
+            new_nodes,
+        )
+
     def test_split_images_not_text(self):
         node = TextNode(
             "This is text with an ![image](https://i.imgur.com/zjjcJKZ.png) and another ![second image](https://i.imgur.com/3elNhQu.png)",
@@ -209,7 +235,64 @@ class TestParser(unittest.TestCase):
                 TextNode("link", TextType.LINK, "https://boot.dev"),
             ]
         )
-   
+
+    def test_text_to_textnodes_starts_with_span(self):
+        nodes = text_to_textnodes("**bold** then [link](https://boot.dev)")
+        self.assertListEqual(nodes,
+            [
+                TextNode("bold", TextType.BOLD),
+                TextNode(" then ", TextType.TEXT),
+                TextNode("link", TextType.LINK, "https://boot.dev"),
+            ]
+        )
+
+    def test_text_to_textnodes_underscore_in_url(self):
+        nodes = text_to_textnodes("See [docs](https://boot.dev/a_b_c) and _this_")
+        self.assertListEqual(nodes,
+            [
+                TextNode("See ", TextType.TEXT),
+                TextNode("docs", TextType.LINK, "https://boot.dev/a_b_c"),
+                TextNode(" and ", TextType.TEXT),
+                TextNode("this", TextType.ITALIC),
+            ]
+        )
+
+    def test_text_to_textnodes_unmatched_bracket(self):
+        nodes = text_to_textnodes("Not a ![link] [nor this](")
+        self.assertListEqual(nodes, [TextNode("Not a ![link] [nor this](", TextType.TEXT)])
+
+    def test_text_to_textnodes_not_close_delimiter(self):
+        with self.assertRaises(ValueError) as cm:
+            text_to_textnodes("This text is `invalid")
+        exception_value = cm.exception
+        self.assertEqual(exception_value.args, ("Missing closing delimiter",))
+
+    def test_text_to_tokens(self):
+        texts = [
+            "This is **text** with an _italic_ word and a `code block` and an ![obi wan image](https://i.imgur.com/fJRm4Vk.jpeg) and a [link](https://boot.dev)",
+            "**bold** then [link](https://boot.dev)",
+            "See [docs](https://boot.dev/a_b_c) and _this_",
+            "Not a ![link] [nor this](",
+            "",
+        ]
+        for text in texts:
+            tokens = text_to_tokens(text)
+            self.assertIs(tokens.source, text)
+            self.assertListEqual(tokens.to_textnodes(), text_to_textnodes(text))
+
+    def test_text_to_tokens_offsets(self):
+        tokens = text_to_tokens("a [b](c)")
+        self.assertEqual(list(tokens.starts), [0, 3])
+        self.assertEqual(list(tokens.ends), [2, 4])
+        self.assertEqual(list(tokens.url_indexes), [-1, 0])
+        self.assertEqual((tokens.url_starts[0], tokens.url_ends[0]), (6, 7))
+
+    def test_text_to_tokens_not_close_delimiter(self):
+        with self.assertRaises(ValueError) as cm:
+            text_to_tokens("This text is **invalid")
+        exception_value = cm.exception
+        self.assertEqual(exception_value.args, ("Missing closing delimiter",))
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,58 @@
+import unittest
+
+import block
+import page
+import profiling
+from htmlnode import HTMLNode, LeafNode, ParentNode
+
+class TestProfiling(unittest.TestCase):
+    def tearDown(self):
+        profiling.disable()
+
+    def test_enable_and_disable(self):
+        original = block.block_to_block_type
+        original_to_html = HTMLNode.to_html
+        profiling.enable()
+        self.assertTrue(profiling.is_enabled())
+        self.assertIsNot(block.block_to_block_type, original)
+        self.assertIs(page.block_to_block_type, block.block_to_block_type)
+        profiling.disable()
+        self.assertFalse(profiling.is_enabled())
+        self.assertIs(block.block_to_block_type, original)
+        self.assertIs(page.block_to_block_type, original)
+        self.assertIs(HTMLNode.to_html, original_to_html)
+
+    def test_profile_page(self):
+        profiling.enable(trace=True)
+        with profiling.profile_page("index.md") as page_profile:
+            html = page.markdown_to_html_node("# Title\n\nSome **bold** text").to_html()
+        page.markdown_to_html_node("Outside any page")
+        self.assertEqual(html, "<div><h1>Title</h1><p>Some <b>bold</b> text</p></div>")
+        self.assertEqual(page_profile.stages["markdown_to_blocks"][0], 1)
+        self.assertEqual(page_profile.stages["block_to_block_type"][0], 2)
+        self.assertEqual(page_profile.stages["text_to_tokens"][2], 4)
+        self.assertEqual(page_profile.stages["to_html"][2], 5)
+        self.assertEqual(len(page_profile.events), 6)
+        self.assertGreater(page_profile.seconds, 0)
+
+    def test_profile_page_disabled(self):
+        with profiling.profile_page("index.md") as page_profile:
+            ParentNode("p", [LeafNode(None, "text")]).to_html()
+        self.assertEqual(page_profile.stages, {})
+        self.assertIsNone(page_profile.events)
+
+    def test_build_profile_report(self):
+        build_profile = profiling.BuildProfile()
+        for name, seconds in (("fast.md", 0.001), ("slow.md", 0.005)):
+            page_profile = profiling.PageProfile(name)
+            page_profile.seconds = seconds
+            page_profile.record("text_to_textnodes", 0.0, seconds / 2, 10)
+            build_profile.add(page_profile)
+        self.assertEqual([profile.page for profile in build_profile.slowest_pages(1)], ["slow.md"])
+        self.assertEqual(build_profile.stage_totals()["text_to_textnodes"], [2, 0.003, 20])
+        report = build_profile.format_report(1)
+        self.assertTrue(report.startswith("Slowest 1 of 2 pages:\n       5.00 ms  slow.md"))
+        self.assertIn("text_to_textnodes", report)
+
+if __name__ == "__main__":
+    unittest.main()
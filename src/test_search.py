@@ -0,0 +1,44 @@
+import json
+import unittest
+
+from parser import text_to_tokens
+from search import HEADING_WEIGHT, build_search_index, page_terms, token_texts
+
+class TestSearch(unittest.TestCase):
+    def test_token_texts(self):
+        tokens = text_to_tokens("Plain **bold** _it_ `code` [link](/a) ![alt](/b.png)")
+        self.assertEqual(token_texts(tokens), ["Plain ", "bold", " ", "it", " ", " ", "link", " "])
+
+    def test_page_terms(self):
+        terms = page_terms(["The quick_brown fox", " and THE dog. A"], ["**Quick** start"])
+        self.assertEqual(terms, {"the": 2, "quick": 1 + HEADING_WEIGHT, "brown": 1, "fox": 1, "and": 1, "dog": 1, "start": HEADING_WEIGHT})
+
+    def load(self, files, name):
+        return json.loads(files[name].decode("utf-8"))
+
+    def test_build_search_index(self):
+        documents = [("/index.html", "Home", {"alpha": 1, "beta": 5}), ("/b.html", "B", {"alpha": 3})]
+        files = build_search_index(documents)
+        index = self.load(files, "index.json")
+        self.assertEqual(index["documents"], [["/index.html", "Home"], ["/b.html", "B"]])
+        self.assertEqual(index["shards"], [["alpha", "terms-0.json"]])
+        self.assertEqual(self.load(files, "terms-0.json"), {"alpha": [1, 3, 0, 1], "beta": [0, 5]})
+
+    def test_shards(self):
+        terms = {f"term{number:03}": 1 for number in range(200)}
+        files = build_search_index([("/a.html", "A", terms)], shard_bytes=256)
+        index = self.load(files, "index.json")
+        self.assertGreater(len(index["shards"]), 1)
+        merged = {}
+        for first, name in index["shards"]:
+            shard = self.load(files, name)
+            self.assertEqual(next(iter(shard)), first)
+            self.assertLessEqual(len(files[name]), 256)
+            merged.update(shard)
+        self.assertEqual(sorted(merged), sorted(terms))
+
+    def test_empty(self):
+        self.assertEqual(self.load(build_search_index([]), "index.json")["shards"], [])
+
+if __name__ == "__main__":
+    unittest.main()
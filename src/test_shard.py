@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+class TestShard(unittest.TestCase):
+    def test_local(self):
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "shard.py")
+        with tempfile.TemporaryDirectory() as root:
+            content = os.path.join(root, "content")
+            os.makedirs(content)
+            for index in range(6):
+                with open(os.path.join(content, f"page{index}.md"), "w", encoding="utf-8") as file:
+                    file.write(f"# Page {index}\n\n[missing](/missing{index})")
+            template = os.path.join(root, "template.html")
+            with open(template, "w", encoding="utf-8") as file:
+                file.write("{{ Content }}")
+            public = os.path.join(root, "public")
+            result = subprocess.run([sys.executable, script, "local", "2", "--content", content, "--template", template,
+                                     "--static", os.path.join(root, "static"), "--root", os.path.join(root, "shards"),
+                                     "--public", public, "--manifest", os.path.join(root, "manifest.json")],
+                                    capture_output=True, text=True, check=True)
+            self.assertIn("Merged 6 pages from 2 shards", result.stdout)
+            self.assertIn("6 dangling", result.stdout)
+            self.assertEqual(sorted(os.listdir(public)), [f"page{index}.html" for index in range(6)])
+
+    def test_invalid_index(self):
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "shard.py")
+        result = subprocess.run([sys.executable, script, "build", "2", "2"], capture_output=True, text=True)
+        self.assertEqual(result.returncode, 2)
+        self.assertIn("shard index", result.stderr)
+
+if __name__ == "__main__":
+    unittest.main()
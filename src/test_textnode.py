@@ -1,6 +1,6 @@
 import unittest
 
-from textnode import TextNode, TextType
+from textnode import InlineTokens, TextNode, TextType
 
 
 class TestTextNode(unittest.TestCase):
@@ -21,6 +21,12 @@ class TestTextNode(unittest.TestCase):
         self.assertEqual(node.text_type, TextType.LINK)
         self.assertEqual(node.url, "https://www.youtube.com/watch?v=xJXJXguW684")
 
+    def test_slots(self):
+        node = TextNode("This is a text node", TextType.TEXT)
+        self.assertFalse(hasattr(node, "__dict__"))
+        with self.assertRaises(AttributeError):
+            node.extra = True
+
     def test_repr_without_url(self):
         node = TextNode("This is a text node", TextType.TEXT)
         self.assertEqual(str(node), "TextNode(This is a text node, text, None)")
@@ -29,5 +35,38 @@ class TestTextNode(unittest.TestCase):
         node = TextNode("This is a url node", TextType.LINK, "https://www.youtube.com/watch?v=xJXJXguW684")
         self.assertEqual(str(node), "TextNode(This is a url node, link, https://www.youtube.com/watch?v=xJXJXguW684)")
 
+
+class TestInlineTokens(unittest.TestCase):
+    def make_tokens(self):
+        tokens = InlineTokens("Go **now** to [docs](https://boot.dev)")
+        tokens.append(TextType.TEXT, 0, 3)
+        tokens.append(TextType.BOLD, 5, 8)
+        tokens.append(TextType.TEXT, 10, 14)
+        tokens.append(TextType.LINK, 15, 19, 21, 37)
+        return tokens
+
+    def test_accessors(self):
+        tokens = self.make_tokens()
+        self.assertEqual(len(tokens), 4)
+        self.assertEqual(tokens.text(1), "now")
+        self.assertEqual(tokens.text_type(1), TextType.BOLD)
+        self.assertEqual(tokens.url(1), None)
+        self.assertEqual(tokens.url(3), "https://boot.dev")
+
+    def test_textnode_view(self):
+        tokens = self.make_tokens()
+        expected = [
+            TextNode("Go ", TextType.TEXT),
+            TextNode("now", TextType.BOLD),
+            TextNode(" to ", TextType.TEXT),
+            TextNode("docs", TextType.LINK, "https://boot.dev"),
+        ]
+        self.assertListEqual(tokens.to_textnodes(), expected)
+        self.assertListEqual(list(tokens), expected)
+        self.assertEqual(tokens[-1], expected[-1])
+
+    def test_repr(self):
+        self.assertEqual(repr(self.make_tokens()), "InlineTokens(4 tokens, 38 chars)")
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+import urllib.request
+
+from watch import RELOAD_PATH, inject_reload_script, snapshot, start_server, wait_for_change
+
+class TestWatch(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+        self.content = os.path.join(self.root, "content")
+        self.template = os.path.join(self.root, "template.html")
+        os.makedirs(self.content)
+        self.write(self.template, "{{ Content }}")
+        self.write(os.path.join(self.content, "index.md"), "# Home")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, path, text):
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+
+    def test_snapshot(self):
+        state = snapshot(self.content, self.template)
+        self.assertEqual(sorted(state), sorted([self.template, os.path.join(self.content, "index.md")]))
+        self.write(os.path.join(self.content, "index.md"), "# Home, edited")
+        self.assertNotEqual(snapshot(self.content, self.template), state)
+
+    def test_wait_for_change_debounces(self):
+        state = snapshot(self.content, self.template)
+        clock = [0.0]
+        edits = [
+            lambda: None,
+            lambda: self.write(os.path.join(self.content, "a.md"), "# A"),
+            lambda: self.write(os.path.join(self.content, "b.md"), "# B"),
+        ]
+
+        def sleep(seconds):
+            clock[0] += seconds
+            if edits:
+                edits.pop(0)()
+
+        new_state = wait_for_change(state, self.content, self.template, 0.1, 0.3, sleep, lambda: clock[0])
+        self.assertIn(os.path.join(self.content, "b.md"), new_state)
+        self.assertGreaterEqual(clock[0], 0.3 + 0.2)
+
+    def test_inject_reload_script(self):
+        html = inject_reload_script(b"<html><body><p>x</p></body></html>")
+        self.assertTrue(html.startswith(b"<html><body><p>x</p><script>"))
+        self.assertTrue(html.endswith(b"</script></body></html>"))
+        self.assertTrue(inject_reload_script(b"<p>x</p>").startswith(b"<p>x</p><script>"))
+
+    def test_server(self):
+        public = os.path.join(self.root, "public")
+        os.makedirs(public)
+        self.write(os.path.join(public, "index.html"), "<body>home</body>")
+        self.write(os.path.join(public, "styles.css"), "p {}")
+        server = start_server(public, "127.0.0.1", 0, {"id": 7})
+        try:
+            base = f"http://127.0.0.1:{server.server_address[1]}"
+            with urllib.request.urlopen(f"{base}/") as response:
+                self.assertIn(b"home<script>", response.read())
+            with urllib.request.urlopen(f"{base}/styles.css") as response:
+                self.assertEqual(response.read(), b"p {}")
+            with urllib.request.urlopen(f"{base}{RELOAD_PATH}") as response:
+                self.assertEqual(response.read(), b"7")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == "__main__":
+    unittest.main()
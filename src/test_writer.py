@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+
+from writer import OutputWriter, file_has_bytes, write_file_atomic
+
+class TestWriter(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def read(self, path):
+        with open(path, "rb") as file:
+            return file.read()
+
+    def test_write_file_atomic(self):
+        path = os.path.join(self.root, "a", "b.html")
+        write_file_atomic(path, b"one")
+        write_file_atomic(path, b"two")
+        self.assertEqual(self.read(path), b"two")
+        self.assertEqual(os.listdir(os.path.dirname(path)), ["b.html"])
+
+    def test_file_has_bytes(self):
+        path = os.path.join(self.root, "a.html")
+        self.assertFalse(file_has_bytes(path, b"x"))
+        write_file_atomic(path, b"abc")
+        self.assertTrue(file_has_bytes(path, b"abc"))
+        self.assertFalse(file_has_bytes(path, b"abd"))
+        self.assertFalse(file_has_bytes(path, b"abcd"))
+
+    def test_writes_files(self):
+        with OutputWriter(workers=2, max_pending=2) as writer:
+            for i in range(20):
+                writer.submit(os.path.join(self.root, f"page{i}.html"), b"x" * i)
+        self.assertEqual(writer.files_written, 20)
+        self.assertEqual(writer.files_skipped, 0)
+        self.assertEqual(writer.bytes_written, sum(range(20)))
+        self.assertEqual(self.read(os.path.join(self.root, "page7.html")), b"x" * 7)
+
+    def test_skips_unchanged(self):
+        path = os.path.join(self.root, "index.html")
+        write_file_atomic(path, b"same")
+        os.utime(path, ns=(0, 0))
+        with OutputWriter() as writer:
+            writer.submit(path, b"same")
+        self.assertEqual(writer.files_skipped, 1)
+        self.assertEqual(writer.bytes_written, 0)
+        self.assertEqual(os.stat(path).st_mtime_ns, 0)
+
+    def test_raises_write_errors(self):
+        blocker = os.path.join(self.root, "file")
+        write_file_atomic(blocker, b"")
+        writer = OutputWriter()
+        writer.submit(os.path.join(blocker, "page.html"), b"x")
+        with self.assertRaises(OSError):
+            writer.close()
+
+    def test_keeps_body_exception(self):
+        blocker = os.path.join(self.root, "file")
+        write_file_atomic(blocker, b"")
+        with self.assertRaises(KeyError):
+            with OutputWriter() as writer:
+                writer.submit(os.path.join(blocker, "page.html"), b"x")
+                raise KeyError("render failed")
+
+    def test_repr(self):
+        writer = OutputWriter()
+        writer.close()
+        self.assertEqual(repr(writer), "OutputWriter(0 written, 0 unchanged, 0 bytes)")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+from array import array
 from enum import Enum
 
 class TextType(Enum):
@@ -10,6 +11,8 @@ class TextType(Enum):
 
 
 class TextNode:
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text : str, text_type : TextType, url : str = None):
         self.text = text
         self.text_type = text_type
@@ -19,4 +22,64 @@ class TextNode:
         return self.text == other.text and self.text_type == other.text_type and self.url == other.url
     
     def __repr__(self):
-        return f"TextNode({self.text}, {self.text_type.value}, {self.url})"
\ No newline at end of file
+        return f"TextNode({self.text}, {self.text_type.value}, {self.url})"
+
+TEXT_TYPES = list(TextType)
+TEXT_TYPE_CODES = {text_type: code for code, text_type in enumerate(TEXT_TYPES)}
+
+class InlineTokens:
+    __slots__ = ("source", "types", "starts", "ends", "url_indexes", "url_starts", "url_ends")
+
+    def __init__(self, source : str):
+        self.source = source
+        self.types = array("B")
+        self.starts = array("q")
+        self.ends = array("q")
+        self.url_indexes = array("q")
+        self.url_starts = array("q")
+        self.url_ends = array("q")
+
+    def append(self, text_type : TextType, start : int, end : int, url_start : int = -1, url_end : int = -1) -> None:
+        self.types.append(TEXT_TYPE_CODES[text_type])
+        self.starts.append(start)
+        self.ends.append(end)
+        if url_start < 0:
+            self.url_indexes.append(-1)
+        else:
+            self.url_indexes.append(len(self.url_starts))
+            self.url_starts.append(url_start)
+            self.url_ends.append(url_end)
+
+    def text_type(self, index : int) -> TextType:
+        return TEXT_TYPES[self.types[index]]
+
+    def text(self, index : int) -> str:
+        return self.source[self.starts[index]:self.ends[index]]
+
+    def url(self, index : int) -> str:
+        url_index = self.url_indexes[index]
+        if url_index < 0:
+            return None
+        return self.source[self.url_starts[url_index]:self.url_ends[url_index]]
+
+    def to_textnodes(self) -> list[TextNode]:
+        source = self.source
+        url_starts = self.url_starts
+        url_ends = self.url_ends
+        text_nodes = []
+        for code, start, end, url_index in zip(self.types, self.starts, self.ends, self.url_indexes):
+            url = None if url_index < 0 else source[url_starts[url_index]:url_ends[url_index]]
+            text_nodes.append(TextNode(source[start:end], TEXT_TYPES[code], url))
+        return text_nodes
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, index : int) -> TextNode:
+        return TextNode(self.text(index), self.text_type(index), self.url(index))
+
+    def __iter__(self):
+        return iter(self.to_textnodes())
+
+    def __repr__(self):
+        return f"InlineTokens({len(self.types)} tokens, {len(self.source)} chars)"
@@ -0,0 +1,125 @@
+import argparse
+import functools
+import os
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from build import build_site
+
+RELOAD_PATH = "/__build_id"
+RELOAD_SCRIPT = (
+    "<script>(function(){var id=null;setInterval(function(){"
+    f"fetch('{RELOAD_PATH}').then(function(r){{return r.text();}}).then(function(t){{"
+    "if(id!==null&&t!==id){location.reload();}id=t;}).catch(function(){});},300);})();</script>"
+)
+
+def snapshot(content_dir : str, template_path : str, static_dir : str = None) -> dict[str, tuple[int, int]]:
+    paths = [template_path]
+    for directory in (content_dir, static_dir):
+        if directory is None:
+            continue
+        for dir_path, _, file_names in os.walk(directory):
+            paths.extend(os.path.join(dir_path, file_name) for file_name in file_names)
+    state = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        state[path] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+def wait_for_change(previous : dict, content_dir : str, template_path : str, interval : float = 0.1, debounce : float = 0.2, sleep = time.sleep, clock = time.monotonic, static_dir : str = None) -> dict:
+    current = previous
+    while current == previous:
+        sleep(interval)
+        current = snapshot(content_dir, template_path, static_dir)
+    quiet_since = clock()
+    while clock() - quiet_since < debounce:
+        sleep(interval)
+        latest = snapshot(content_dir, template_path, static_dir)
+        if latest != current:
+            current = latest
+            quiet_since = clock()
+    return current
+
+def inject_reload_script(html : bytes) -> bytes:
+    script = RELOAD_SCRIPT.encode("utf-8")
+    index = html.rfind(b"</body>")
+    if index == -1:
+        return html + script
+    return html[:index] + script + html[index:]
+
+class DevRequestHandler(SimpleHTTPRequestHandler):
+    build_state : dict = None
+
+    def do_GET(self):
+        if self.path == RELOAD_PATH:
+            self._send(200, "text/plain", str(self.build_state["id"]).encode("utf-8"))
+            return
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            path = os.path.join(path, "index.html")
+        if path.endswith(".html") and os.path.isfile(path):
+            with open(path, "rb") as file:
+                self._send(200, "text/html; charset=utf-8", inject_reload_script(file.read()))
+            return
+        super().do_GET()
+
+    def _send(self, status : int, content_type : str, body : bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server(public_dir : str, host : str, port : int, build_state : dict) -> ThreadingHTTPServer:
+    handler = type("BoundDevRequestHandler", (DevRequestHandler,), {"build_state": build_state})
+    server = ThreadingHTTPServer((host, port), functools.partial(handler, directory=public_dir))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def rebuild(args : argparse.Namespace, build_state : dict) -> None:
+    start = time.perf_counter()
+    try:
+        report = build_site(args.content, args.template, args.public, args.manifest, static_dir=args.static)
+    except Exception as error:
+        print(f"Build failed: {error}")
+        return
+    elapsed = time.perf_counter() - start
+    build_state["id"] += 1
+    changed = ", ".join(report.rendered + [f"-{source}" for source in report.removed]) or "nothing"
+    print(f"Rebuilt {len(report.rendered)} page(s), removed {len(report.removed)} in {elapsed * 1000:.1f} ms: {changed}")
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Rebuild the site on change and serve it locally.")
+    arg_parser.add_argument("--content", default="content", help="directory of markdown pages")
+    arg_parser.add_argument("--template", default="template.html", help="HTML page template")
+    arg_parser.add_argument("--public", default="public", help="output directory")
+    arg_parser.add_argument("--static", default="static", help="directory of static assets copied into the output")
+    arg_parser.add_argument("--manifest", default=".build/manifest.json", help="manifest used for incremental rebuilds")
+    arg_parser.add_argument("--host", default="127.0.0.1", help="address to serve on")
+    arg_parser.add_argument("--port", type=int, default=8888, help="port to serve on")
+    arg_parser.add_argument("--interval", type=float, default=0.05, help="seconds between checks for changes")
+    arg_parser.add_argument("--debounce", type=float, default=0.1, help="seconds without changes before rebuilding")
+    args = arg_parser.parse_args()
+
+    build_state = {"id": 0}
+    rebuild(args, build_state)
+    server = start_server(args.public, args.host, args.port, build_state)
+    print(f"Serving {args.public} at http://{args.host}:{server.server_address[1]}/")
+    state = snapshot(args.content, args.template, args.static)
+    try:
+        while True:
+            state = wait_for_change(state, args.content, args.template, args.interval, args.debounce, static_dir=args.static)
+            rebuild(args, build_state)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
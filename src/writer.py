@@ -0,0 +1,93 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+def temp_path_for(path : str) -> str:
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+def write_file_atomic(path : str, data : bytes) -> None:
+    temp_path = temp_path_for(path)
+    try:
+        with open(temp_path, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def file_has_bytes(path : str, data : bytes) -> bool:
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, "rb") as file:
+            return file.read() == data
+    except FileNotFoundError:
+        return False
+
+def remove_output(public_dir : str, output : str) -> None:
+    path = os.path.join(public_dir, output)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return
+    directory = os.path.dirname(path)
+    while os.path.abspath(directory) != os.path.abspath(public_dir):
+        try:
+            os.rmdir(directory)
+        except OSError:
+            return
+        directory = os.path.dirname(directory)
+
+class OutputWriter:
+    def __init__(self, workers : int = 4, max_pending : int = 64):
+        self.files_written = 0
+        self.files_skipped = 0
+        self.bytes_written = 0
+        self._lock = threading.Lock()
+        self._pending = threading.BoundedSemaphore(max_pending)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="output-writer")
+        self._futures = []
+
+    def submit(self, path : str, data : bytes) -> None:
+        self._pending.acquire()
+        try:
+            future = self._pool.submit(self._write, path, data)
+        except BaseException:
+            self._pending.release()
+            raise
+        self._futures.append(future)
+
+    def _write(self, path : str, data : bytes) -> None:
+        try:
+            if file_has_bytes(path, data):
+                with self._lock:
+                    self.files_skipped += 1
+                return
+            write_file_atomic(path, data)
+            with self._lock:
+                self.files_written += 1
+                self.bytes_written += len(data)
+        finally:
+            self._pending.release()
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+        futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+            return
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        self._futures = []
+
+    def __repr__(self):
+        return f"OutputWriter({self.files_written} written, {self.files_skipped} unchanged, {self.bytes_written} bytes)"